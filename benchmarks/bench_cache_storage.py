@@ -0,0 +1,59 @@
+"""
+Compares the built-in cache storages of scoped injectors.
+
+Usage: python benchmarks/bench_cache_storage.py
+"""
+import timeit
+
+from dite import ScopedInjector, begin_scope, cached_value, dynamic_value, scope_template
+from dite.cache_storage import ContextVarCacheStorage, GlobalCacheStorage, SlotCacheStorage, ThreadLocalCacheStorage
+
+
+STORAGES = [ContextVarCacheStorage, SlotCacheStorage, ThreadLocalCacheStorage, GlobalCacheStorage]
+NUMBER = 100_000
+
+
+def make_container(storage):
+    class Container(ScopedInjector, storage=storage):
+        user = dynamic_value
+        request = dynamic_value
+
+        @cached_value
+        def session(user, request):
+            return (user, request)
+
+    return Container
+
+
+def bench(storage):
+    Container = make_container(storage)
+    template = scope_template(Container)
+    cache = Container.__di_cache__
+
+    def enter_scope():
+        with template.enter(user="alice", request="/home"):
+            pass
+
+    def resolve_in_scope():
+        with begin_scope(Container, user="alice", request="/home"):
+            _ = Container.session
+            _ = Container.session
+
+    with template.enter(user="alice", request="/home"):
+        _ = Container.session
+        key = cache.attr_keys.get("session", "session")
+        lookup = min(timeit.repeat(lambda: cache[key], number=NUMBER, repeat=5))
+    enter = min(timeit.repeat(enter_scope, number=NUMBER, repeat=5))
+    resolve = min(timeit.repeat(resolve_in_scope, number=NUMBER // 10, repeat=5)) * 10
+    return lookup, enter, resolve
+
+
+def main():
+    print(f"{'storage':<26}{'lookup, ns':>12}{'enter, ns':>12}{'resolve, ns':>14}")
+    for storage in STORAGES:
+        lookup, enter, resolve = (t / NUMBER * 1e9 for t in bench(storage))
+        print(f"{storage.__name__:<26}{lookup:>12.0f}{enter:>12.0f}{resolve:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
-from .injector import Injector
-from .scoped_injector import ScopedInjector, begin_scope
+from .injector import Injector, resolve, aresolve, map_operation
+from .scoped_injector import ScopedInjector, begin_scope, begin_scopes, scope_template
 from .factories.package import Package
 from .factories.value import Value as _Value
 from .factories.cached_value import CachedValue as cached_value
-from .factories.dynamic_value import dynamic_value
+from .factories.thread_local_cached_value import ThreadLocalCachedValue as thread_local_cached_value
+from .factories.weak_cached_value import WeakCachedValue as weak_cached_value
+from .factories.persistent_cached_value import PersistentCachedValue as persistent_cached_value
+from .factories.shared_cached_value import SharedCachedValue as shared_cached_value
+from .factories.pooled_value import PooledValue as pooled_value, pool_stats
+from .factories.sharded_value import ShardedValue as sharded_value
+from .factories.async_value import AsyncValue as async_value, AsyncCachedValue as async_cached_value
+from .factories.dynamic_value import dynamic_value, Lazy as lazy
 from .factories.this import This as _This
 from .exceptions import DependencyError
+from .introspection import lazy_dependency
+from .resources import shutdown, ashutdown
+from .batch import resolve_batch
+from .session import session
+from .warm_up import warm_up
 
 value = _Value.for_function
 operation = _Value.for_deferred_function
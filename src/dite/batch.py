@@ -0,0 +1,88 @@
+import functools
+from contextvars import copy_context
+
+from .builder import build
+from .chunking import map_in_chunks
+from .dependency import Dependency
+from .exceptions import DependencyError
+from .graph import direct_dependencies, reaches
+from .scoped_injector import Scope, _get_scoped_injector, _check_dynamic_values
+
+
+def resolve_batch(injector, name, values, common=None, executor=None, chunksize=1, max_in_flight=16):
+    injector_type = _get_scoped_injector(injector, "resolve_batch()")
+    if injector_type.__di_abstract__:
+        raise DependencyError("resolve_batch() should be applied to a concrete injector")
+    if chunksize < 1 or max_in_flight < 1:
+        raise ValueError("chunksize and max_in_flight should be positive integers")
+    common = dict(common or {})
+    item_attrs = injector_type.__di_dynamic_values__ - common.keys()
+    target = Dependency(injector, name)
+    batch = _Batch(injector_type, target, common, item_attrs)
+    if executor is None:
+        return batch.iter_sequentially(values)
+    return batch.iter_in_parallel(values, executor, chunksize, max_in_flight)
+
+
+class _Batch:
+    def __init__(self, injector, target, common, item_attrs):
+        self.injector = injector
+        self.target = target
+        self.common = common
+        self.item_attrs = item_attrs
+
+    def iter_sequentially(self, values):
+        context, setup_scope, shared = self._build_shared()
+        try:
+            for item in values:
+                yield self._resolve_item(item, shared)
+        finally:
+            context.run(setup_scope.stop)
+
+    def iter_in_parallel(self, values, executor, chunksize, max_in_flight):
+        context, setup_scope, shared = self._build_shared()
+        resolve_item = functools.partial(self._resolve_item, shared=shared)
+        results = map_in_chunks(executor, resolve_item, values, chunksize, max_in_flight)
+        try:
+            yield from results
+        finally:
+            results.close()
+            context.run(setup_scope.stop)
+
+    def _build_shared(self):
+        # the values which don't depend on the per item dynamic values are built once, in a scope
+        # having only the common values; the scope lives in a copy of the context until the batch is over,
+        # the items don't need it, since their scopes get the shared values with the builder memo
+        item_dependencies = {Dependency(self.injector, attr) for attr in self.item_attrs}
+        memo = {}
+        frontier = []
+        visited = set()
+        backlog = [self.target]
+        while backlog:
+            current = backlog.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+            if reaches(current, item_dependencies, memo):
+                backlog.extend(direct_dependencies(current))
+            else:
+                frontier.append(current)
+        context = copy_context()
+        setup_scope = Scope(self.injector, self.common)
+        context.run(setup_scope.start)
+        shared = {}
+        try:
+            for current in frontier:
+                context.run(build, current, shared)
+        except BaseException:
+            context.run(setup_scope.stop)
+            raise
+        return context, setup_scope, shared
+
+    def _resolve_item(self, item, shared):
+        if item.keys() != self.item_attrs:
+            _check_dynamic_values(self.injector, {**self.common, **item}, "resolve_batch()")
+            overridden = ", ".join(sorted(item.keys() & self.common.keys()))
+            raise DependencyError(f"resolve_batch() got common dynamic values within an item: {overridden}.")
+        with Scope(self.injector, {**self.common, **item}):
+            return build(self.target, dict(shared))
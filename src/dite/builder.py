@@ -1,11 +1,25 @@
+import asyncio
+from collections import deque
+from concurrent.futures import wait, FIRST_COMPLETED
+from contextvars import copy_context
+
 from .exceptions import TrackedCallerError
+from .factories.factory import AsyncFactory
+from .factories.thread_local_cached_value import ThreadLocalCachedValue
+from .factories.value import Value
 
 
-def build(target):
-    built_values = {}
+def build(target, built_values=None):
+    # the given built values are reused, e.g. the shared part of the graph in resolve_batch()
+    if built_values is None:
+        built_values = {}
     backlog = [(target, None)]
     while backlog:
         current_target, cause = backlog[-1]
+        if current_target in built_values:
+            # has been built for another dependent meanwhile
+            backlog.pop()
+            continue
         try:
             factory = current_target.factory
             creation_context, unsatisfied = factory.prepare(built_values, current_target)
@@ -18,3 +32,106 @@ def build(target):
         except TrackedCallerError as e:
             raise e.with_cause(cause)
     return built_values[target]
+
+
+def build_in_parallel(target, executor, max_in_flight=None):
+    built_values = {}
+    causes = {target: None}
+    dependents = {}
+    remaining = {}
+    backlog = [target]
+    ready = deque()
+    in_flight = {}
+
+    def prepare(current_target):
+        try:
+            factory = current_target.factory
+            creation_context, unsatisfied = factory.prepare(built_values, current_target)
+        except TrackedCallerError as e:
+            raise e.with_cause(causes[current_target])
+        if not unsatisfied:
+            ready.append((current_target, factory, creation_context))
+            return
+        remaining[current_target] = len(unsatisfied)
+        for value in unsatisfied:
+            if value in dependents:
+                # is being built for another dependent already
+                dependents[value].append(current_target)
+            else:
+                dependents[value] = [current_target]
+                causes[value] = current_target
+                backlog.append(value)
+
+    def create(current_target, factory, creation_context):
+        try:
+            return factory.create(current_target, creation_context)
+        except TrackedCallerError as e:
+            raise e.with_cause(causes[current_target])
+
+    def finish(current_target, value):
+        built_values[current_target] = value
+        for dependent in dependents.get(current_target, ()):
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                backlog.append(dependent)
+
+    try:
+        while target not in built_values:
+            while backlog:
+                prepare(backlog.pop())
+            while ready and (max_in_flight is None or len(in_flight) < max_in_flight):
+                current_target, factory, creation_context = ready.popleft()
+                if _runs_in_caller_thread(factory):
+                    finish(current_target, create(current_target, factory, creation_context))
+                else:
+                    future = executor.submit(copy_context().run, create, current_target, factory, creation_context)
+                    in_flight[future] = current_target
+            if backlog or not in_flight:
+                continue
+            completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finish(in_flight.pop(future), future.result())
+    finally:
+        for future in in_flight:
+            future.cancel()
+    return built_values[target]
+
+
+def _runs_in_caller_thread(factory):
+    # cheap factories aren't worth a round trip to the executor,
+    # thread local values have to be cached for the calling thread
+    return not isinstance(factory, Value) or isinstance(factory, (AsyncFactory, ThreadLocalCachedValue))
+
+
+async def abuild(target):
+    built_values = {}
+    tasks = {}
+
+    def schedule(current_target, cause):
+        if current_target not in tasks:
+            tasks[current_target] = asyncio.ensure_future(build_one(current_target, cause))
+        return tasks[current_target]
+
+    async def build_one(current_target, cause):
+        try:
+            factory = current_target.factory
+            creation_context, unsatisfied = factory.prepare(built_values, current_target)
+            while unsatisfied:
+                # independent dependencies are built concurrently
+                await asyncio.gather(*(schedule(value, current_target) for value in unsatisfied))
+                creation_context, unsatisfied = factory.prepare(built_values, current_target)
+            if isinstance(factory, AsyncFactory):
+                built_values[current_target] = await factory.acreate(current_target, creation_context)
+            else:
+                built_values[current_target] = factory.create(current_target, creation_context)
+        except TrackedCallerError as e:
+            if e.cause is None:
+                e.with_cause(cause)
+            raise
+
+    try:
+        await schedule(target, None)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    return built_values[target]
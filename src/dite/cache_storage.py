@@ -1,9 +1,137 @@
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
 from contextvars import ContextVar
+from types import MappingProxyType
 
+from .exceptions import DependencyError
 
-class ContextVarCacheStorage:
-    def __init__(self, injector_name):
-        self._var = ContextVar(f'{injector_name}._Context')
+
+_storages = weakref.WeakSet()
+
+
+def create_storage(injector, storage_class):
+    if not isinstance(storage_class, type) or not issubclass(storage_class, CacheStorage):
+        raise DependencyError("Injector storage should be a CacheStorage subclass")
+    storage = storage_class(injector)
+    _storages.add(storage)
+    return storage
+
+
+def _discard_fork_unsafe_values():
+    for storage in list(_storages):
+        storage.discard_fork_unsafe_values()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_discard_fork_unsafe_values)
+
+
+class CacheStorage(ABC):
+    # a storage is created with the injector class: storage_class(injector),
+    # missing keys are reported with KeyError, when there is no active scope - with LookupError,
+    # discard_fork_unsafe_values() is called for every storage in the child process after os.fork()
+    is_active = True
+    # the keys used instead of the attribute names, a dependency looks its key up once when it's created,
+    # the storage accepts the attribute names as well
+    attr_keys = MappingProxyType({})
+
+    @abstractmethod
+    def __getitem__(self, key):   # pragma: no cover
+        value = None
+        return value
+
+    @abstractmethod
+    def __setitem__(self, key, value):   # pragma: no cover
+        pass
+
+    @abstractmethod
+    def __contains__(self, key):   # pragma: no cover
+        is_stored = False
+        return is_stored
+
+    @abstractmethod
+    def clear(self):   # pragma: no cover
+        # removes all the values (of the active scope for scoped storages)
+        pass
+
+    @abstractmethod
+    def discard_on_fork(self, key):   # pragma: no cover
+        # the key has to be removed in the child process after os.fork()
+        pass
+
+    @abstractmethod
+    def discard_fork_unsafe_values(self):   # pragma: no cover
+        pass
+
+
+class ScopedCacheStorage(CacheStorage):
+    @property
+    @abstractmethod
+    def is_active(self):   # pragma: no cover
+        is_active = False
+        return is_active
+
+    @abstractmethod
+    def start(self, values=()):   # pragma: no cover
+        # the values become the initial content of the new scope,
+        # the scope which was active before is restored by stop(token)
+        token = None
+        return token
+
+    @abstractmethod
+    def stop(self, token):   # pragma: no cover
+        pass
+
+    @abstractmethod
+    def active_scope(self):   # pragma: no cover
+        # an opaque handle of the active scope content, it can be passed to snapshot() from any thread or context
+        scope = None
+        return scope
+
+    @abstractmethod
+    def snapshot(self, scope=None):   # pragma: no cover
+        # a copy of the given scope content, the active scope is used by default
+        content = {}
+        return content
+
+    def fork_unsafe_keys(self, scope):
+        # the keys of the given scope which are discarded on fork
+        return frozenset()
+
+
+class _ScopedStorageForkSupport:
+    # every active scope of the injector has its own set of values to discard on fork
+    def discard_on_fork(self, key):
+        scope = self._get_scope()
+        if id(scope) not in self._fork_unsafe_scopes:
+            scope.fork_unsafe = set()
+            self._fork_unsafe_scopes[id(scope)] = scope
+        scope.fork_unsafe.add(key)
+
+    def fork_unsafe_keys(self, scope):
+        return frozenset(getattr(scope, 'fork_unsafe', ()))
+
+    def _forget_fork_unsafe_values(self, scope):
+        if hasattr(scope, 'fork_unsafe'):
+            scope.fork_unsafe.clear()
+
+    def discard_fork_unsafe_values(self):
+        for scope in list(self._fork_unsafe_scopes.values()):
+            for key in scope.fork_unsafe:
+                self._discard(scope, key)
+            scope.fork_unsafe.clear()
+
+
+class _ScopeStorage(dict):
+    __slots__ = ('fork_unsafe', '__weakref__')
+
+
+class ContextVarCacheStorage(_ScopedStorageForkSupport, ScopedCacheStorage):
+    def __init__(self, injector):
+        self._var = ContextVar(f'{injector.__qualname__}._Context')
+        self._fork_unsafe_scopes = weakref.WeakValueDictionary()
 
     def __getitem__(self, item):
         storage = self._var.get()
@@ -19,16 +147,224 @@ class ContextVarCacheStorage:
             return False
         return item in storage
 
-    def start(self):
-        return self._var.set({})
+    def clear(self):
+        storage = self._var.get()
+        storage.clear()
+        self._forget_fork_unsafe_values(storage)
+
+    @property
+    def is_active(self):
+        return self._var.get(None) is not None
+
+    def start(self, values=()):
+        return self._var.set(_ScopeStorage(values))
+
+    def stop(self, token):
+        self._var.reset(token)
+
+    def active_scope(self):
+        return self._var.get()
+
+    def snapshot(self, scope=None):
+        return dict(self._var.get() if scope is None else scope)
+
+    def _get_scope(self):
+        return self._var.get()
+
+    def _discard(self, scope, key):
+        scope.pop(key, None)
+
+
+_EMPTY = object()
+
+
+class _SlotScope(list):
+    # 'extra' holds the keys without a slot (e.g. the internal ones or added by testing.override_factories())
+    __slots__ = ('extra', 'fork_unsafe', '__weakref__')
+
+
+class SlotCacheStorage(_ScopedStorageForkSupport, ScopedCacheStorage):
+    # every attribute gets a slot when the injector is created, a scope is a list of a fixed size,
+    # the dependencies read and write their slots by index
+    def __init__(self, injector):
+        from .factories import Nested
+        self._var = ContextVar(f'{injector.__qualname__}._Slots')
+        self._fork_unsafe_scopes = weakref.WeakValueDictionary()
+        attrs = [attr for attr, factory in injector.__di_factories__.items() if not isinstance(factory, Nested)]
+        self.attr_keys = MappingProxyType({attr: slot for slot, attr in enumerate(attrs)})
+        self._empty = [_EMPTY] * len(attrs)
+        self._attrs = attrs
+
+    def __getitem__(self, item):
+        scope = self._var.get()
+        if type(item) is not int:
+            return self._get_by_name(scope, item)
+        value = scope[item]
+        if value is _EMPTY:
+            raise KeyError(self._attrs[item])
+        return value
+
+    def __setitem__(self, key, value):
+        scope = self._var.get()
+        if type(key) is not int:
+            self._set_by_name(scope, key, value)
+        else:
+            scope[key] = value
+
+    def __contains__(self, item):
+        scope = self._var.get(None)
+        if scope is None:
+            return False
+        if type(item) is not int:
+            item = self.attr_keys.get(item, item)
+            if type(item) is not int:
+                return scope.extra is not None and item in scope.extra
+        return scope[item] is not _EMPTY
+
+    def clear(self):
+        scope = self._var.get()
+        scope[:] = self._empty
+        scope.extra = None
+        self._forget_fork_unsafe_values(scope)
+
+    @property
+    def is_active(self):
+        return self._var.get(None) is not None
+
+    def start(self, values=()):
+        scope = _SlotScope(self._empty)
+        scope.extra = None
+        for key, value in dict(values).items():
+            slot = self.attr_keys.get(key)
+            if slot is None:
+                self._set_by_name(scope, key, value)
+            else:
+                scope[slot] = value
+        return self._var.set(scope)
 
     def stop(self, token):
         self._var.reset(token)
 
+    def active_scope(self):
+        return self._var.get()
+
+    def snapshot(self, scope=None):
+        scope = self._var.get() if scope is None else scope
+        result = {attr: value for attr, value in zip(self._attrs, scope) if value is not _EMPTY}
+        if scope.extra is not None:
+            result.update(scope.extra)
+        return result
+
+    def discard_on_fork(self, key):
+        # the marks are kept by attribute names, so fork_unsafe_keys() returns the names
+        super().discard_on_fork(self._attrs[key] if type(key) is int else key)
+
+    def _get_scope(self):
+        return self._var.get()
+
+    def _get_by_name(self, scope, name):
+        slot = self.attr_keys.get(name)
+        if slot is None:
+            if scope.extra is None:
+                raise KeyError(name)
+            return scope.extra[name]
+        value = scope[slot]
+        if value is _EMPTY:
+            raise KeyError(name)
+        return value
+
+    def _set_by_name(self, scope, name, value):
+        slot = self.attr_keys.get(name)
+        if slot is not None:
+            scope[slot] = value
+        elif scope.extra is None:
+            scope.extra = {name: value}
+        else:
+            scope.extra[name] = value
+
+    def _discard(self, scope, key):
+        slot = self.attr_keys.get(key)
+        if slot is not None:
+            scope[slot] = _EMPTY
+        elif scope.extra is not None:
+            scope.extra.pop(key, None)
+
+
+class _HeldScopeStorage:
+    # the active scope is an attribute of the holder: a plain object or a thread-local one
+    def __getitem__(self, item):
+        return self._get_scope()[item]
+
+    def __setitem__(self, key, value):
+        self._get_scope()[key] = value
+
+    def __contains__(self, item):
+        scope = self._holder.scope
+        if scope is None:
+            return False
+        return item in scope
+
+    def clear(self):
+        scope = self._get_scope()
+        scope.clear()
+        self._forget_fork_unsafe_values(scope)
+
+    @property
+    def is_active(self):
+        return self._holder.scope is not None
+
+    def start(self, values=()):
+        token = self._holder.scope
+        self._holder.scope = _ScopeStorage(values)
+        return token
+
+    def stop(self, token):
+        self._holder.scope = token
+
+    def active_scope(self):
+        return self._get_scope()
+
+    def snapshot(self, scope=None):
+        return dict(self._get_scope() if scope is None else scope)
+
+    def _get_scope(self):
+        scope = self._holder.scope
+        if scope is None:
+            raise LookupError(f"There is no active scope of {self._injector_name}")
+        return scope
+
+    def _discard(self, scope, key):
+        scope.pop(key, None)
+
 
-class DictCacheStorage:
-    def __init__(self):
+class _ScopeHolder:
+    scope = None
+
+
+class _ThreadLocalScopeHolder(threading.local):
+    scope = None
+
+
+class GlobalCacheStorage(_HeldScopeStorage, _ScopedStorageForkSupport, ScopedCacheStorage):
+    # avoids ContextVar overhead, but the scopes are shared by all threads and asyncio tasks
+    def __init__(self, injector):
+        self._injector_name = injector.__qualname__
+        self._holder = _ScopeHolder()
+        self._fork_unsafe_scopes = weakref.WeakValueDictionary()
+
+
+class ThreadLocalCacheStorage(_HeldScopeStorage, _ScopedStorageForkSupport, ScopedCacheStorage):
+    # the scopes are separate for every thread, but shared by asyncio tasks running in the thread
+    def __init__(self, injector):
+        self._injector_name = injector.__qualname__
+        self._holder = _ThreadLocalScopeHolder()
+        self._fork_unsafe_scopes = weakref.WeakValueDictionary()
+
+
+class DictCacheStorage(CacheStorage):
+    def __init__(self, injector):
         self._storage = {}
+        self._fork_unsafe = set()
 
     def __getitem__(self, item):
         return self._storage[item]
@@ -38,3 +374,15 @@ class DictCacheStorage:
 
     def __contains__(self, item):
         return item in self._storage
+
+    def clear(self):
+        self._storage.clear()
+        self._fork_unsafe.clear()
+
+    def discard_on_fork(self, key):
+        self._fork_unsafe.add(key)
+
+    def discard_fork_unsafe_values(self):
+        for key in self._fork_unsafe:
+            self._storage.pop(key, None)
+        self._fork_unsafe.clear()
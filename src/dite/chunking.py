@@ -0,0 +1,32 @@
+import itertools
+from collections import deque
+from contextvars import copy_context
+
+
+def map_in_chunks(executor, function, iterable, chunksize=1, max_in_flight=16):
+    # the results are yielded in order, at most max_in_flight chunks are submitted at a time,
+    # the workers see the scopes active in the caller
+    if chunksize < 1 or max_in_flight < 1:
+        raise ValueError("chunksize and max_in_flight should be positive integers")
+    return _map_in_chunks(executor, function, iter(iterable), chunksize, max_in_flight)
+
+
+def _map_in_chunks(executor, function, items, chunksize, max_in_flight):
+    in_flight = deque()
+    try:
+        while True:
+            while len(in_flight) < max_in_flight:
+                chunk = list(itertools.islice(items, chunksize))
+                if not chunk:
+                    break
+                in_flight.append(executor.submit(copy_context().run, _apply, function, chunk))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def _apply(function, chunk):
+    return [function(item) for item in chunk]
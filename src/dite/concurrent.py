@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextvars import copy_context
+
+from .factories.dynamic_value import snapshot_dynamic_value
+from .graph import iter_injectors
+from .scoped_injector import ScopedInjector, begin_scopes
+
+
+def submit_in_scope(executor, fn, *args, **kwargs):
+    # copying the context is cheap and brings all the active scopes to the worker,
+    # the scopes are not started again, so begin_scope() checks are not repeated
+    context = copy_context()
+    return executor.submit(context.run, fn, *args, **kwargs)
+
+
+class ScopedThreadPoolExecutor(ThreadPoolExecutor):
+    def submit(self, fn, *args, **kwargs):
+        context = copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+class ScopedProcessPoolExecutor(ProcessPoolExecutor):
+    # the injector and the submitted callables are pickled, so they should be importable by the workers
+    def __init__(self, injector, max_workers=None, warm_up=False, initializer=None, initargs=(), **kwargs):
+        if not isinstance(injector, type):
+            injector = type(injector)
+        self.injector = injector
+        initargs = (injector, warm_up, initializer, initargs)
+        super().__init__(max_workers, initializer=_initialize_worker, initargs=initargs, **kwargs)
+
+    def submit(self, fn, *args, **kwargs):
+        snapshot = snapshot_scopes(self.injector)
+        return super().submit(_run_in_scopes, self.injector, snapshot, fn, *args, **kwargs)
+
+
+def snapshot_scopes(injector):
+    # the dynamic values of the active scopes of the injector and the injectors nested in it,
+    # nested injector classes can't be pickled, so they are referred by the path from the injector;
+    # lazy values which are not evaluated yet are shipped as they are, nothing is built here
+    snapshot = {}
+    for path, injector_type in _iter_injector_types(injector):
+        if not issubclass(injector_type, ScopedInjector) or not injector_type.__di_cache__.is_active:
+            continue
+        content = injector_type.__di_cache__.snapshot()
+        snapshot[path] = {
+            attr: snapshot_dynamic_value(content[attr]) for attr in injector_type.__di_dynamic_values__
+        }
+    return snapshot
+
+
+def restore_scopes(injector, snapshot):
+    injector_types = dict(_iter_injector_types(injector))
+    return begin_scopes({injector_types[path]: values for path, values in snapshot.items()})
+
+
+def _iter_injector_types(injector):
+    for path, current in iter_injectors(injector):
+        yield path, current if isinstance(current, type) else type(current)
+
+
+def _initialize_worker(injector, warm_up, initializer, initargs):
+    if warm_up:
+        from .warm_up import warm_up as warm_up_injector
+        warm_up_injector(injector, freeze=False)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_in_scopes(injector, snapshot, fn, *args, **kwargs):
+    with restore_scopes(injector, snapshot):
+        return fn(*args, **kwargs)
@@ -10,6 +10,7 @@ class Dependency:
         self.injector_type = injector
         if not isinstance(injector, type):
             self.injector_type = type(injector)
+        self.cache_key = self.injector_type.__di_cache__.attr_keys.get(attr, attr)
 
     def __hash__(self):
         return hash((self.injector_type, self.attr))
@@ -36,10 +37,13 @@ class Dependency:
 
     @property
     def is_in_cache(self):
-        return self.attr in self.injector_type.__di_cache__
+        return self.cache_key in self.injector_type.__di_cache__
 
     def get_from_cache(self):
-        return self.injector_type.__di_cache__[self.attr]
+        return self.injector_type.__di_cache__[self.cache_key]
 
     def store_in_cache(self, value):
-        self.injector_type.__di_cache__[self.attr] = value
+        self.injector_type.__di_cache__[self.cache_key] = value
+
+    def discard_from_cache_on_fork(self):
+        self.injector_type.__di_cache__.discard_on_fork(self.cache_key)
@@ -10,6 +10,15 @@ class WrongParameterTypeError(DependencyError):
         return "*args, **kwargs and positional-only parameters are not supported."
 
 
+class PoolTimeoutError(DependencyError):
+    def __init__(self, dependency, timeout):
+        self.dependency = dependency
+        self.timeout = timeout
+
+    def __str__(self):
+        return f"No instance of '{self.dependency}' became available within {self.timeout} seconds"
+
+
 class CycleDetectedError(DependencyError):
     def __init__(self, cycles):
         self.cycles = cycles
@@ -87,6 +96,16 @@ class UnknownAttributeError(TrackedCallerError):
         return f"Attribute '{self.dependency}' doesn't exist{suffix}"
 
 
+class AsyncValueAccessError(TrackedCallerError):
+    def __init__(self, dependency):
+        super().__init__()
+        self.dependency = dependency
+
+    def __str__(self):
+        suffix = super().__str__()
+        return f"'{self.dependency}' is an async value, it can be built with 'aresolve()' only{suffix}"
+
+
 class UnknownDirectAttributeError(UnknownAttributeError, AttributeError):
     """
     An error raised by __getattr__() should be an instance of AttributeError,
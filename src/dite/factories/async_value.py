@@ -0,0 +1,74 @@
+import asyncio
+import inspect
+
+from .cached_value import CachedValue
+from .factory import AsyncFactory
+from .value import Value
+from ..exceptions import DependencyError
+from ..resources import enter_async_generator
+
+
+def _check_coroutine_function(function, name):
+    if not (inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function)):
+        raise DependencyError(f"'{name}' decorator can be used on coroutine and async generator functions only")
+
+
+async def _acall(function, dependency, kwargs):
+    if inspect.isasyncgenfunction(function):
+        return await enter_async_generator(dependency, function(**kwargs))
+    return await function(**kwargs)
+
+
+class AsyncValue(AsyncFactory, Value):
+    def __init__(self, function):
+        _check_coroutine_function(function, 'async_value')
+        super().__init__(function, args=Value._inspect_args(function, False), deferred=False)
+
+    async def acreate(self, dependency, kwargs):
+        return await _acall(self.function, dependency, kwargs)
+
+
+class AsyncCachedValue(AsyncFactory, CachedValue):
+    def __init__(self, function, **options):
+        _check_coroutine_function(function, 'async_cached_value')
+        super().__init__(function, **options)
+
+    async def acreate(self, dependency, kwargs):
+        entry = self._lookup(dependency)
+        if entry is None or (isinstance(entry, _Flight) and entry.failed):
+            entry = self._start_flight(dependency, kwargs)
+        if isinstance(entry, _Flight):
+            # the waiters share the build, cancelling one of them doesn't cancel it for the others
+            await asyncio.shield(entry.task)
+            entry = entry.task.result(), entry.creation_kwargs
+        value, creation_kwargs = entry
+        self._check_stale_kwargs(dependency, creation_kwargs, kwargs)
+        return value
+
+    def _start_flight(self, dependency, kwargs):
+        flight = _Flight(asyncio.ensure_future(self._build_async(dependency, kwargs)), kwargs)
+        try:
+            self._store(dependency, flight)
+        except LookupError:
+            flight.task.cancel()
+            raise DependencyError("cached_value usage is disallowed when there is no active scope")
+        return flight
+
+    async def _build_async(self, dependency, kwargs):
+        value = await _acall(self.function, dependency, kwargs)
+        self._cache(dependency, kwargs, value)
+        return value
+
+
+class _Flight:
+    # is stored in the cache instead of the cached value while the value is being built
+    __slots__ = ('task', 'creation_kwargs')
+
+    def __init__(self, task, kwargs):
+        self.task = task
+        self.creation_kwargs = {k: id(v) for k, v in kwargs.items()}
+
+    @property
+    def failed(self):
+        # a failed build is not cached, the value is built again on the next access
+        return self.task.done() and (self.task.cancelled() or self.task.exception() is not None)
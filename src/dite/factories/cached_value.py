@@ -1,9 +1,8 @@
-import inspect
 import logging
 
-from .value import Value
+from .value import ConfigurableValue
 from ..exceptions import DependencyError
-from ..introspection import inspect_function_args, inspect_method_args
+from ..prefetch import PendingEntry
 
 
 cached_value_logger = logging.getLogger(__name__)
@@ -13,15 +12,13 @@ DEPS_CHANGED_TEMPLATE = (
 )
 
 
-class CachedValue(Value):
-    def __init__(self, function):
-        if inspect.isclass(function):
-            args = inspect_method_args(function.__init__)
-        else:
-            args = inspect_function_args(function)
-            if inspect.ismethod(function) or (len(args) > 0 and args[0][0] == 'self'):
-                raise DependencyError("'cached_value' decorator can not be used on methods")
-        super().__init__(function, args=args, deferred=False)
+class CachedValue(ConfigurableValue):
+    decorator_name = 'cached_value'
+
+    def __init__(self, function, fork_safe=True, prefetch=False):
+        super().__init__(function, args=self._inspect_callable_args(function), deferred=False)
+        self.fork_safe = fork_safe
+        self.prefetch = prefetch
 
     @classmethod
     def _inspect_args(cls, value, deferred):
@@ -34,21 +31,50 @@ class CachedValue(Value):
     for_deferred_function = for_function = for_class
 
     def create(self, dependency, kwargs):
-        if dependency.is_in_cache:
-            value, creation_kwargs = dependency.get_from_cache()
+        entry = self._lookup(dependency)
+        if entry is not None:
+            value, creation_kwargs = entry
             self._check_stale_kwargs(dependency, creation_kwargs, kwargs)
             return value
-        value = self.function(**kwargs)
+        value = self._build(dependency, kwargs)
+        self._cache(dependency, kwargs, value)
+        return value
+
+    def _cache(self, dependency, kwargs, value):
         creation_kwargs = {k: id(v) for k, v in kwargs.items()}
         try:
-            dependency.store_in_cache((value, creation_kwargs))
+            self._store(dependency, (value, creation_kwargs))
         except LookupError:
             raise DependencyError("cached_value usage is disallowed when there is no active scope")
-        return value
+
+    def _build(self, dependency, kwargs):
+        return self._call(dependency, kwargs)
+
+    def _lookup(self, dependency):
+        if dependency.is_in_cache:
+            entry = dependency.get_from_cache()
+            if isinstance(entry, PendingEntry):
+                return entry.wait(dependency)
+            return entry
+        return None
+
+    def _store(self, dependency, entry):
+        dependency.store_in_cache(entry)
+        if not self.fork_safe:
+            dependency.discard_from_cache_on_fork()
 
     def _check_stale_kwargs(self, dependency, creation_kwargs, current_kwargs):
-        current_kwargs = {k: id(v) for k, v in current_kwargs.items()}
+        # the lazy proxies are created on every access, they aren't compared
+        current_kwargs = {k: id(v) for k, v in current_kwargs.items() if k not in self.lazy_args}
         violators = [k for k, v in current_kwargs.items() if v != creation_kwargs[k]]
+        # a weak cached dependency is rebuilt once nothing refers to it, so the cached value doesn't use the old one
+        violators = [k for k in violators if not self._is_weak_dependency(dependency, k)]
         if violators:
             violators_str = ", ".join(repr(v) for v in violators)
             cached_value_logger.warning(DEPS_CHANGED_TEMPLATE.format(dependency=dependency, violators=violators_str))
+
+    @staticmethod
+    def _is_weak_dependency(dependency, attr):
+        from .weak_cached_value import WeakCachedValue
+        factory = dependency.factories.get(attr)
+        return isinstance(factory, WeakCachedValue)
@@ -1,3 +1,5 @@
+import threading
+
 from .factory import Factory, LazyFactory
 from ..exceptions import DynamicValueNotSetError
 
@@ -11,15 +13,61 @@ class _DynamicValue(LazyFactory):
 
 
 class DynamicValueFactory(Factory):
+    def __init__(self):
+        self._lock = threading.Lock()
+
     def prepare(self, built_values, target):
         return {}, []
 
     def create(self, dependency, kwargs):
         if dependency.is_in_cache:
-            return dependency.get_from_cache()
+            value = dependency.get_from_cache()
+            if isinstance(value, Lazy):
+                with self._lock:
+                    value = dependency.get_from_cache()
+                    if isinstance(value, Lazy):
+                        # the evaluation state lives in the scope cache, the Lazy itself may be shared by many scopes
+                        value = _Evaluation(value.function)
+                        dependency.store_in_cache(value)
+            if isinstance(value, _Evaluation):
+                value = value.evaluate()
+                dependency.store_in_cache(value)
+            return value
         raise DynamicValueNotSetError(dependency)
 
 
+class Lazy:
+    def __init__(self, function):
+        self.function = function
+
+
+class _Evaluation:
+    def __init__(self, function):
+        self.function = function
+        self._lock = threading.Lock()
+        self._is_evaluated = False
+        self._value = None
+
+    def snapshot(self):
+        with self._lock:
+            return self._value if self._is_evaluated else Lazy(self.function)
+
+    def evaluate(self):
+        if not self._is_evaluated:
+            with self._lock:
+                if not self._is_evaluated:
+                    self._value = self.function()
+                    self._is_evaluated = True
+        return self._value
+
+
+def snapshot_dynamic_value(entry):
+    # the built value, or the lazy value to be evaluated by the receiver if it's still needed
+    if isinstance(entry, _Evaluation):
+        return entry.snapshot()
+    return entry
+
+
 def init_dynamic_values(injector):
     dynamic_values = set()
     for attr, value in injector.__di_factories__.items():
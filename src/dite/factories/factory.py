@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from ..exceptions import AsyncValueAccessError
+
 
 class Factory(ABC):
     @abstractmethod
@@ -13,6 +15,16 @@ class Factory(ABC):
         return created_instance
 
 
+class AsyncFactory(Factory):
+    def create(self, dependency, kwargs):
+        raise AsyncValueAccessError(dependency)
+
+    @abstractmethod
+    async def acreate(self, dependency, kwargs):   # pragma: no cover
+        created_instance = None
+        return created_instance
+
+
 class LazyFactory(ABC):
     # some of LazyFactory subclasses override '__getattr__' method and might have arbitrary attributes
     # have to use '__di_' prefix and '__' suffix here and in those subclasses to avoid name collision
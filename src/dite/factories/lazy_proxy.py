@@ -0,0 +1,294 @@
+import math
+import operator
+import threading
+from contextvars import copy_context
+
+
+_NOT_BUILT = object()
+
+
+class LazyProxy:
+    """
+    Is injected instead of a parameter having 'lazy_dependency' default value.
+    The dependency is built on the first usage within the context the proxy was created in,
+    the proxy holds a copy of that context (with all its scopes) until then and releases it afterwards.
+    """
+    __slots__ = ('__di_dependency__', '__di_context__', '__di_lock__', '__di_value__')
+
+    def __init__(self, dependency):
+        object.__setattr__(self, '__di_dependency__', dependency)
+        object.__setattr__(self, '__di_context__', copy_context())
+        object.__setattr__(self, '__di_lock__', threading.RLock())
+        object.__setattr__(self, '__di_value__', _NOT_BUILT)
+
+    def __di_get__(self):
+        value = object.__getattribute__(self, '__di_value__')
+        if value is _NOT_BUILT:
+            with object.__getattribute__(self, '__di_lock__'):
+                value = object.__getattribute__(self, '__di_value__')
+                if value is _NOT_BUILT:
+                    from ..builder import build
+                    context = object.__getattribute__(self, '__di_context__')
+                    value = context.run(build, object.__getattribute__(self, '__di_dependency__'))
+                    object.__setattr__(self, '__di_value__', value)
+                    object.__setattr__(self, '__di_context__', None)
+        return value
+
+    @property
+    def __class__(self):
+        return type(self.__di_get__())
+
+    def __getattr__(self, name):
+        return getattr(self.__di_get__(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.__di_get__(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__di_get__(), name)
+
+    def __repr__(self):
+        return repr(self.__di_get__())
+
+    def __str__(self):
+        return str(self.__di_get__())
+
+    def __bool__(self):
+        return bool(self.__di_get__())
+
+    def __eq__(self, other):
+        return self.__di_get__() == other
+
+    def __ne__(self, other):
+        return self.__di_get__() != other
+
+    def __hash__(self):
+        return hash(self.__di_get__())
+
+    def __len__(self):
+        return len(self.__di_get__())
+
+    def __iter__(self):
+        return iter(self.__di_get__())
+
+    def __contains__(self, item):
+        return item in self.__di_get__()
+
+    def __getitem__(self, key):
+        return self.__di_get__()[key]
+
+    def __setitem__(self, key, value):
+        self.__di_get__()[key] = value
+
+    def __delitem__(self, key):
+        del self.__di_get__()[key]
+
+    def __call__(self, *args, **kwargs):
+        return self.__di_get__()(*args, **kwargs)
+
+    def __enter__(self):
+        return self.__di_get__().__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.__di_get__().__exit__(exc_type, exc_val, exc_tb)
+
+    def __aenter__(self):
+        return self.__di_get__().__aenter__()
+
+    def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__di_get__().__aexit__(exc_type, exc_val, exc_tb)
+
+    def __await__(self):
+        return self.__di_get__().__await__()
+
+    def __aiter__(self):
+        return self.__di_get__().__aiter__()
+
+    def __anext__(self):
+        return self.__di_get__().__anext__()
+
+    def __next__(self):
+        return next(self.__di_get__())
+
+    def __reversed__(self):
+        return reversed(self.__di_get__())
+
+    def __dir__(self):
+        return dir(self.__di_get__())
+
+    def __format__(self, format_spec):
+        return format(self.__di_get__(), format_spec)
+
+    def __bytes__(self):
+        return bytes(self.__di_get__())
+
+    def __lt__(self, other):
+        return self.__di_get__() < other
+
+    def __le__(self, other):
+        return self.__di_get__() <= other
+
+    def __gt__(self, other):
+        return self.__di_get__() > other
+
+    def __ge__(self, other):
+        return self.__di_get__() >= other
+
+    def __neg__(self):
+        return -self.__di_get__()
+
+    def __pos__(self):
+        return +self.__di_get__()
+
+    def __abs__(self):
+        return abs(self.__di_get__())
+
+    def __invert__(self):
+        return ~self.__di_get__()
+
+    def __int__(self):
+        return int(self.__di_get__())
+
+    def __float__(self):
+        return float(self.__di_get__())
+
+    def __complex__(self):
+        return complex(self.__di_get__())
+
+    def __index__(self):
+        return operator.index(self.__di_get__())
+
+    def __round__(self, *args):
+        return round(self.__di_get__(), *args)
+
+    def __trunc__(self):
+        return math.trunc(self.__di_get__())
+
+    def __floor__(self):
+        return math.floor(self.__di_get__())
+
+    def __ceil__(self):
+        return math.ceil(self.__di_get__())
+
+    def __pow__(self, other, *args):
+        return pow(self.__di_get__(), other, *args)
+
+    def __rpow__(self, other):
+        return pow(other, self.__di_get__())
+
+    def __ipow__(self, other):
+        return operator.ipow(self.__di_get__(), other)
+
+    def __divmod__(self, other):
+        return divmod(self.__di_get__(), other)
+
+    def __rdivmod__(self, other):
+        return divmod(other, self.__di_get__())
+
+    def __add__(self, other):
+        return self.__di_get__() + other
+
+    def __radd__(self, other):
+        return other + self.__di_get__()
+
+    def __iadd__(self, other):
+        return operator.iadd(self.__di_get__(), other)
+
+    def __sub__(self, other):
+        return self.__di_get__() - other
+
+    def __rsub__(self, other):
+        return other - self.__di_get__()
+
+    def __isub__(self, other):
+        return operator.isub(self.__di_get__(), other)
+
+    def __mul__(self, other):
+        return self.__di_get__() * other
+
+    def __rmul__(self, other):
+        return other * self.__di_get__()
+
+    def __imul__(self, other):
+        return operator.imul(self.__di_get__(), other)
+
+    def __matmul__(self, other):
+        return self.__di_get__() @ other
+
+    def __rmatmul__(self, other):
+        return other @ self.__di_get__()
+
+    def __imatmul__(self, other):
+        return operator.imatmul(self.__di_get__(), other)
+
+    def __truediv__(self, other):
+        return self.__di_get__() / other
+
+    def __rtruediv__(self, other):
+        return other / self.__di_get__()
+
+    def __itruediv__(self, other):
+        return operator.itruediv(self.__di_get__(), other)
+
+    def __floordiv__(self, other):
+        return self.__di_get__() // other
+
+    def __rfloordiv__(self, other):
+        return other // self.__di_get__()
+
+    def __ifloordiv__(self, other):
+        return operator.ifloordiv(self.__di_get__(), other)
+
+    def __mod__(self, other):
+        return self.__di_get__() % other
+
+    def __rmod__(self, other):
+        return other % self.__di_get__()
+
+    def __imod__(self, other):
+        return operator.imod(self.__di_get__(), other)
+
+    def __lshift__(self, other):
+        return self.__di_get__() << other
+
+    def __rlshift__(self, other):
+        return other << self.__di_get__()
+
+    def __ilshift__(self, other):
+        return operator.ilshift(self.__di_get__(), other)
+
+    def __rshift__(self, other):
+        return self.__di_get__() >> other
+
+    def __rrshift__(self, other):
+        return other >> self.__di_get__()
+
+    def __irshift__(self, other):
+        return operator.irshift(self.__di_get__(), other)
+
+    def __and__(self, other):
+        return self.__di_get__() & other
+
+    def __rand__(self, other):
+        return other & self.__di_get__()
+
+    def __iand__(self, other):
+        return operator.iand(self.__di_get__(), other)
+
+    def __xor__(self, other):
+        return self.__di_get__() ^ other
+
+    def __rxor__(self, other):
+        return other ^ self.__di_get__()
+
+    def __ixor__(self, other):
+        return operator.ixor(self.__di_get__(), other)
+
+    def __or__(self, other):
+        return self.__di_get__() | other
+
+    def __ror__(self, other):
+        return other | self.__di_get__()
+
+    def __ior__(self, other):
+        return operator.ior(self.__di_get__(), other)
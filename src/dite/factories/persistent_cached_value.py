@@ -0,0 +1,55 @@
+import mmap
+import os
+import tempfile
+
+from .cached_value import CachedValue
+from ..exceptions import DependencyError
+from .. import serialization
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "dite")
+
+
+class PersistentCachedValue(CachedValue):
+    def __init__(self, function, path=None, key=None, **options):
+        super().__init__(function, **options)
+        if self.is_generator:
+            raise DependencyError("'persistent_cached_value' can not be used on generator functions")
+        self.path = path or os.environ.get("DITE_CACHE_DIR", DEFAULT_PATH)
+        self.key = key
+
+    def _build(self, dependency, kwargs):
+        filename = self._filename(dependency, kwargs)
+        try:
+            return _load(filename)
+        except FileNotFoundError:
+            pass
+        value = super()._build(dependency, kwargs)
+        _dump(value, filename)
+        # the value is loaded back, so every process (including this one) uses the same memory-mapped value
+        return _load(filename)
+
+    def _filename(self, dependency, kwargs):
+        fingerprint = serialization.fingerprint(dependency, self.function, kwargs, self.key)
+        return os.path.join(self.path, f"{self.function.__name__}-{fingerprint}.dite")
+
+
+def _load(filename):
+    with open(filename, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return serialization.deserialize(mapping)
+
+
+def _dump(value, filename):
+    directory = os.path.dirname(filename)
+    os.makedirs(directory, exist_ok=True)
+    _, parts = serialization.serialize(value)
+    # write to a temporary file and rename it, so concurrent processes never see a partially written file
+    descriptor, temp_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            serialization.write(parts, file)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        os.unlink(temp_filename)
+        raise
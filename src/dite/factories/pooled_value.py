@@ -0,0 +1,223 @@
+import collections
+import functools
+import os
+import threading
+import time
+import weakref
+
+from .cached_value import CachedValue
+from .dynamic_value import DynamicValueFactory
+from .sharded_value import ShardedValue
+from .value import ConfigurableValue
+from ..cache_storage import ScopedCacheStorage
+from ..dependency import Dependency
+from ..exceptions import DependencyError, NoInjectorParentError, PoolTimeoutError
+from ..resources import register_cleanup
+
+
+PoolStats = collections.namedtuple(
+    'PoolStats', 'size idle in_use waiting checkouts created discarded timeouts'
+)
+_pools = weakref.WeakSet()
+
+
+def _reset_pools():
+    for pool in list(_pools):
+        pool.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools)
+
+
+class PooledValue(ConfigurableValue):
+    decorator_name = 'pooled_value'
+    # the pooled instances are connections and clients, the child process creates its own ones
+    fork_safe = False
+
+    def __init__(self, function, maxsize=10, min_idle=0, timeout=None, check=None, reset=None):
+        super().__init__(function, args=self._inspect_callable_args(function), deferred=False)
+        if self.is_generator:
+            raise DependencyError("'pooled_value' can not be used on generator functions")
+        if maxsize < 1 or not 0 <= min_idle <= maxsize:
+            raise DependencyError("'pooled_value' requires maxsize >= 1 and 0 <= min_idle <= maxsize")
+        self.maxsize = maxsize
+        self.min_idle = min_idle
+        self.timeout = timeout
+        self.check = check
+        self.reset = reset
+        self._pools = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def create(self, dependency, kwargs):
+        # an instance is checked out once per scope and checked in when the scope stops
+        if dependency.is_in_cache:
+            return dependency.get_from_cache()
+        pool = self._get_pool(dependency, kwargs)
+        instance = pool.acquire(dependency, functools.partial(self.function, **kwargs))
+        try:
+            dependency.store_in_cache(instance)
+        except LookupError:
+            pool.release(instance)
+            raise DependencyError("pooled_value usage is disallowed when there is no active scope")
+        dependency.discard_from_cache_on_fork()
+        register_cleanup(dependency, functools.partial(pool.release, instance))
+        return instance
+
+    def stats(self, injector_type):
+        pool = self._pools.get(injector_type)
+        if pool is None:
+            return PoolStats(0, 0, 0, 0, 0, 0, 0, 0)
+        return pool.stats()
+
+    def _get_pool(self, dependency, kwargs):
+        with self._lock:
+            pool = self._pools.get(dependency.injector_type)
+            if pool is None:
+                pool = _Pool(self.maxsize, self.timeout, self.check, self.reset)
+                pool.fill(self.min_idle, functools.partial(self.function, **kwargs))
+                self._pools[dependency.injector_type] = pool
+                _pools.add(pool)
+            return pool
+
+
+def validate_pooled_values(injector):
+    # a pool is shared by all the scopes, so its instances can't be built from the values of one of them
+    from ..graph import iter_attributes
+    memo = {}
+    for _, dependency in iter_attributes(injector, PooledValue):
+        try:
+            scope_value = _find_scope_value(dependency, memo)
+        except NoInjectorParentError:
+            continue
+        if scope_value is not None:
+            raise DependencyError(
+                f"'{dependency}' is shared by all the scopes, so it can't depend on the scope value '{scope_value}'"
+            )
+
+
+def _find_scope_value(target, memo):
+    from ..graph import direct_dependencies
+    if target not in memo:
+        memo[target] = None
+        for dependency in direct_dependencies(target):
+            if _is_scope_value(dependency):
+                memo[target] = dependency
+            else:
+                memo[target] = _find_scope_value(dependency, memo)
+            if memo[target] is not None:
+                break
+    return memo[target]
+
+
+def _is_scope_value(dependency):
+    factory = dependency.factory
+    if isinstance(factory, DynamicValueFactory):
+        return True
+    is_scoped = isinstance(dependency.injector_type.__di_cache__, ScopedCacheStorage)
+    return is_scoped and isinstance(factory, (CachedValue, PooledValue, ShardedValue))
+
+
+def pool_stats(injector, name):
+    dependency = Dependency(injector, name)
+    if not isinstance(dependency.factory, PooledValue):
+        raise DependencyError(f"'{dependency}' is not a pooled value")
+    return dependency.factory.stats(dependency.injector_type)
+
+
+class _Pool:
+    def __init__(self, maxsize, timeout, check, reset):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.check = check
+        self.reset = reset
+        self.reset_after_fork()
+
+    def reset_after_fork(self):
+        self._condition = threading.Condition()
+        self._idle = collections.deque()
+        self._size = 0
+        self._waiting = 0
+        self._checkouts = self._created = self._discarded = self._timeouts = 0
+
+    def fill(self, count, create):
+        for _ in range(count):
+            self._idle.append(create())
+            self._size += 1
+            self._created += 1
+
+    def acquire(self, dependency, create):
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            with self._condition:
+                instance = self._checkout(dependency, deadline)
+            if instance is None:
+                return self._create(create)
+            if self.check is None or self._is_healthy(instance):
+                return instance
+            self._discard()
+
+    def _checkout(self, dependency, deadline):
+        # returns an idle instance or None if a new one should be created
+        while not self._idle and self._size >= self.maxsize:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                self._timeouts += 1
+                raise PoolTimeoutError(dependency, self.timeout)
+            self._waiting += 1
+            try:
+                self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+        self._checkouts += 1
+        if self._idle:
+            return self._idle.pop()
+        self._size += 1
+        return None
+
+    def _create(self, create):
+        try:
+            instance = create()
+        except BaseException:
+            self._discard(created=False)
+            raise
+        with self._condition:
+            self._created += 1
+        return instance
+
+    def _is_healthy(self, instance):
+        try:
+            return self.check(instance)
+        except Exception:
+            return False
+
+    def _discard(self, created=True):
+        with self._condition:
+            self._size -= 1
+            if created:
+                self._discarded += 1
+            self._condition.notify()
+
+    def release(self, instance):
+        if self.reset is not None:
+            try:
+                self.reset(instance)
+            except Exception:
+                self._discard()
+                raise
+        with self._condition:
+            self._idle.append(instance)
+            self._condition.notify()
+
+    def stats(self):
+        with self._condition:
+            return PoolStats(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=self._size - len(self._idle),
+                waiting=self._waiting,
+                checkouts=self._checkouts,
+                created=self._created,
+                discarded=self._discarded,
+                timeouts=self._timeouts,
+            )
@@ -0,0 +1,146 @@
+import collections
+import functools
+import threading
+
+from .this import This
+from .value import ConfigurableValue
+from ..cache_storage import ScopedCacheStorage
+from ..exceptions import DependencyError
+from ..resources import register_cleanup
+
+
+class ShardedValue(ConfigurableValue):
+    decorator_name = 'sharded_value'
+
+    def __init__(self, function, key, maxsize=None, on_evict=None, fork_safe=True):
+        args = self._inspect_callable_args(function)
+        if not args:
+            raise DependencyError("'sharded_value' factory should accept the shard key as the first parameter")
+        # the first parameter gets the shard key, the rest of them are resolved as usual
+        super().__init__(function, args=args[1:], deferred=False)
+        if self.is_generator:
+            raise DependencyError("'sharded_value' can not be used on generator functions")
+        if isinstance(key, str):
+            key = getattr(This(), key)
+        if not isinstance(key, This):
+            raise DependencyError("'sharded_value' key should be an attribute name or a 'this' expression")
+        if maxsize is not None and maxsize < 1:
+            raise DependencyError("'sharded_value' requires maxsize >= 1")
+        self.key = key.__di_resolve__(None)
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.fork_safe = fork_safe
+        self._lock = threading.Lock()
+
+    def prepare(self, built_values, target):
+        key_context, key_unsatisfied = self.key.prepare(built_values, target)
+        creation_context, unsatisfied = super().prepare(built_values, target)
+        return (key_context, creation_context), key_unsatisfied + unsatisfied
+
+    def create(self, dependency, kwargs):
+        key_context, kwargs = kwargs
+        key = self.key.create(dependency, key_context)
+        shards = self._get_shards(dependency)
+        checkouts = self._get_scope_checkouts(key_context['target'], shards)
+        with self._lock:
+            checkout = checkouts is not None and key not in checkouts
+            if checkout:
+                checkouts.add(key)
+        try:
+            return shards.get(key, functools.partial(self.function, key, **kwargs), checkout)
+        except BaseException:
+            if checkout:
+                checkouts.discard(key)
+            raise
+
+    def _get_shards(self, dependency):
+        # the shards live as long as the values cached by the injector
+        with self._lock:
+            try:
+                if dependency.is_in_cache:
+                    return dependency.get_from_cache()
+                shards = _Shards(self.maxsize, self.on_evict)
+                dependency.store_in_cache(shards)
+            except LookupError:
+                raise DependencyError("sharded_value usage is disallowed when there is no active scope")
+        if not self.fork_safe:
+            dependency.discard_from_cache_on_fork()
+        if self.on_evict is not None:
+            # the remaining shards are evicted when the scope stops or on shutdown()
+            register_cleanup(dependency, shards.close)
+        return shards
+
+    def _get_scope_checkouts(self, key_dependency, shards):
+        # the shards used by an active scope of the key are checked out until it stops, only idle ones are evicted
+        cache = key_dependency.injector_type.__di_cache__
+        if not isinstance(cache, ScopedCacheStorage) or not cache.is_active:
+            return None
+        marker = f'__di_shards_{id(shards)}__'
+        with self._lock:
+            if marker in cache:
+                return cache[marker]
+            checkouts = set()
+            cache[marker] = checkouts
+        register_cleanup(key_dependency, functools.partial(shards.release, checkouts))
+        return checkouts
+
+
+class _Shards:
+    def __init__(self, maxsize, on_evict):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._instances = collections.OrderedDict()
+        self._checkouts = collections.Counter()
+        self._lock = threading.Lock()
+
+    def get(self, key, create, checkout=False):
+        with self._lock:
+            if key in self._instances:
+                self._instances.move_to_end(key)
+                if checkout:
+                    self._checkouts[key] += 1
+                return self._instances[key]
+        # the shards are built without the lock, so a slow shard doesn't block the others
+        instance = create()
+        with self._lock:
+            if key in self._instances:
+                evicted = [instance]
+                instance = self._instances[key]
+                self._instances.move_to_end(key)
+            else:
+                self._instances[key] = instance
+                evicted = []
+            if checkout:
+                self._checkouts[key] += 1
+            evicted.extend(self._evict_idle(exclude=key))
+        self._notify(evicted)
+        return instance
+
+    def release(self, keys):
+        with self._lock:
+            for key in keys:
+                self._checkouts[key] -= 1
+                if self._checkouts[key] <= 0:
+                    del self._checkouts[key]
+            evicted = self._evict_idle()
+        self._notify(evicted)
+
+    def close(self):
+        with self._lock:
+            evicted = list(self._instances.values())
+            self._instances.clear()
+            self._checkouts.clear()
+        self._notify(evicted)
+
+    def _evict_idle(self, exclude=None):
+        # the least recently used shards which are not checked out, the returned one is kept even if it's idle
+        if self.maxsize is None:
+            return []
+        excess = len(self._instances) - self.maxsize
+        idle = [key for key in self._instances if key != exclude and key not in self._checkouts]
+        return [self._instances.pop(key) for key in idle[:max(excess, 0)]]
+
+    def _notify(self, evicted):
+        if self.on_evict is not None:
+            for instance in evicted:
+                self.on_evict(instance)
@@ -0,0 +1,144 @@
+import atexit
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from .cached_value import CachedValue
+from ..exceptions import DependencyError
+from .. import serialization
+
+
+# segments attached by the process are kept open until it exits, the values refer to their memory
+_segments = {}
+_released_segments = []
+_segments_lock = threading.Lock()
+# a segment is attached or created by one thread at a time, the other segments aren't blocked
+_segment_locks = {}
+
+
+class SharedCachedValue(CachedValue):
+    def __init__(self, function, key=None, **options):
+        super().__init__(function, **options)
+        if self.is_generator:
+            raise DependencyError("'shared_cached_value' can not be used on generator functions")
+        self.key = key
+
+    def _build(self, dependency, kwargs):
+        fingerprint = serialization.fingerprint(dependency, self.function, kwargs, self.key)
+        # some platforms limit the segment name length to 31 characters
+        name = f"dite-{fingerprint[:24]}"
+        segment = _attach_or_create(name, lambda: super(SharedCachedValue, self)._build(dependency, kwargs))
+        return serialization.deserialize(segment.buf)
+
+
+def _attach_or_create(name, build):
+    with _segments_lock:
+        segment = _segments.get(name)
+        if segment is not None:
+            return segment
+        segment_lock = _segment_locks.setdefault(name, threading.Lock())
+    with segment_lock:
+        with _segments_lock:
+            segment = _segments.get(name)
+            if segment is not None:
+                return segment
+        segment = _attach(name)
+        if segment is None:
+            # the value is built without holding the locks, so it may depend on other shared values,
+            # if another process has created the segment meanwhile, the built value is dropped
+            size, parts = serialization.serialize(build())
+            segment = _attach(name, size, parts)
+        with _segments_lock:
+            if not _segments:
+                atexit.register(_release_segments)
+            _segments[name] = segment
+        return segment
+
+
+def _attach(name, size=0, parts=None):
+    # attaches the segment (or creates it if the parts are given) and counts this process as attached
+    with _reference_counter(name) as counter:
+        try:
+            segment = _open_segment(name)
+        except FileNotFoundError:
+            if parts is None:
+                return None
+            segment = _open_segment(name, create=True, size=size)
+            serialization.write_into(parts, segment.buf)
+        counter.write(counter.read() + 1)
+    return segment
+
+
+def _forget_segments():
+    # a forked child isn't counted as attached, so it must not release the segments of the parent,
+    # the inherited mappings are kept since the inherited values refer to their memory
+    global _segments_lock
+    _segments_lock = threading.Lock()
+    _released_segments.extend(_segments.values())
+    _segments.clear()
+    _segment_locks.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_segments)
+
+
+def _open_segment(name, create=False, size=0):
+    from multiprocessing import shared_memory, resource_tracker
+    segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+    # the segment lifetime is managed by the reference counter rather than by the resource tracker,
+    # which would unlink the segment as soon as the first process using it exits
+    if os.name == "posix":
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _release_segments():
+    with _segments_lock:
+        for name in list(_segments):
+            _release_segment(name)
+
+
+def _release_segment(name):
+    segment = _segments.pop(name)
+    with _reference_counter(name) as counter:
+        references = counter.read() - 1
+        counter.write(max(references, 0))
+        if references <= 0:
+            segment.unlink()
+    try:
+        segment.close()
+    except BufferError:
+        # some of the values still refer to the segment memory, the mapping is kept while the process lives
+        _released_segments.append(segment)
+
+
+@contextmanager
+def _reference_counter(name):
+    # the lock file holds the number of processes attached to the segment,
+    # it's locked while the segment is created, attached or released
+    import fcntl
+    path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+    descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(descriptor, "r+") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield _Counter(file)
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+class _Counter:
+    def __init__(self, file):
+        self._file = file
+
+    def read(self):
+        self._file.seek(0)
+        return int(self._file.read() or 0)
+
+    def write(self, value):
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(str(value))
+        self._file.flush()
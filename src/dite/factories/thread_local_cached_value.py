@@ -0,0 +1,30 @@
+import threading
+
+from .cached_value import CachedValue
+from ..exceptions import DependencyError
+
+
+class ThreadLocalCachedValue(CachedValue):
+    def __init__(self, function, **options):
+        super().__init__(function, **options)
+        if self.prefetch:
+            raise DependencyError("'thread_local_cached_value' can not be prefetched")
+        self._lock = threading.Lock()
+
+    def _lookup(self, dependency):
+        if not dependency.is_in_cache:
+            return None
+        return getattr(dependency.get_from_cache(), 'entry', None)
+
+    def _store(self, dependency, entry):
+        # the injector cache holds a single threading.local() per attribute,
+        # every thread keeps its own entry there which is dropped when the thread exits
+        with self._lock:
+            if dependency.is_in_cache:
+                slot = dependency.get_from_cache()
+            else:
+                slot = threading.local()
+                dependency.store_in_cache(slot)
+                if not self.fork_safe:
+                    dependency.discard_from_cache_on_fork()
+        slot.entry = entry
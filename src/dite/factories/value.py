@@ -2,8 +2,11 @@ import functools
 import inspect
 
 from .factory import Factory
-from ..exceptions import DependencyError
-from ..introspection import inspect_method_args, inspect_function_args
+from .lazy_proxy import LazyProxy
+from ..chunking import map_in_chunks
+from ..exceptions import DependencyError, UnknownAttributeError
+from ..introspection import inspect_method_args, inspect_function_args, inspect_lazy_args
+from ..resources import enter_generator
 
 
 class Value(Factory):
@@ -11,6 +14,8 @@ class Value(Factory):
         self.function = function
         self.args = args
         self.deferred = deferred
+        self.is_generator = not deferred and inspect.isgeneratorfunction(function)
+        self.lazy_args = inspect_lazy_args(function.__init__ if inspect.isclass(function) else function)
 
     @classmethod
     def for_class(cls, value):
@@ -42,7 +47,9 @@ class Value(Factory):
         unsatisfied = []
         for attr, is_required in self.args:
             dependency = target.replace_attr(attr)
-            if dependency in built_values:
+            if attr in self.lazy_args:
+                creation_context[attr] = self._get_lazy(dependency, built_values, target)
+            elif dependency in built_values:
                 creation_context[attr] = built_values[dependency]
             else:
                 if is_required or attr in target.factories:
@@ -50,7 +57,57 @@ class Value(Factory):
 
         return creation_context, unsatisfied
 
+    def _get_lazy(self, dependency, built_values, target):
+        if dependency in built_values:
+            return built_values[dependency]
+        try:
+            _ = dependency.factory
+        except UnknownAttributeError as e:
+            raise e.with_reference(target)
+        return LazyProxy(dependency)
+
     def create(self, dependency, kwargs):
         if self.deferred:
-            return functools.partial(self.function, **kwargs)
+            return Operation(self.function, **kwargs)
+        return self._call(dependency, kwargs)
+
+    def _call(self, dependency, kwargs):
+        if self.is_generator:
+            # the code after 'yield' releases the resource when the scope stops or on shutdown()
+            return enter_generator(dependency, self.function(**kwargs))
         return self.function(**kwargs)
+
+
+class ConfigurableValue(Value):
+    # the base of the decorators accepting options, e.g. @cached_value(fork_safe=False)
+    decorator_name = None
+
+    def __new__(cls, function=None, **options):
+        # allows passing options in the decorator form
+        if function is None:
+            return functools.partial(cls, **options)
+        return super().__new__(cls)
+
+    @classmethod
+    def _inspect_callable_args(cls, function):
+        if inspect.isclass(function):
+            return inspect_method_args(function.__init__)
+        args = inspect_function_args(function)
+        if inspect.ismethod(function) or (len(args) > 0 and args[0][0] == 'self'):
+            raise DependencyError(f"'{cls.decorator_name}' decorator can not be used on methods")
+        return args
+
+
+class Operation(functools.partial):
+    def map(self, iterable, argument=None, chunksize=1, executor=None, max_in_flight=16):
+        # the dependencies are bound once, every item is passed positionally or as the given argument
+        function, keywords = self.func, self.keywords
+        if argument is None:
+            def call(item):
+                return function(item, **keywords)
+        else:
+            def call(item):
+                return function(**{argument: item}, **keywords)
+        if executor is None:
+            return map(call, iterable)
+        return map_in_chunks(executor, call, iterable, chunksize, max_in_flight)
@@ -0,0 +1,41 @@
+import weakref
+
+from .cached_value import CachedValue
+from ..exceptions import DependencyError
+
+
+class WeakCachedValue(CachedValue):
+    def __init__(self, function, **options):
+        super().__init__(function, **options)
+        if self.is_generator:
+            # the cleanup would keep the value alive
+            raise DependencyError("'weak_cached_value' can not be used on generator functions")
+
+    def _lookup(self, dependency):
+        entry = super()._lookup(dependency)
+        if entry is None:
+            return None
+        reference, creation_kwargs = entry
+        if not isinstance(reference, weakref.ref):
+            return reference.value, creation_kwargs
+        value = reference()
+        if value is None:
+            return None
+        return value, creation_kwargs
+
+    def _store(self, dependency, entry):
+        value, creation_kwargs = entry
+        try:
+            reference = weakref.ref(value)
+        except TypeError:
+            # instances of some types (e.g. dict, list, int) can not be weakly referenced,
+            # they are cached as usual
+            reference = _StrongReference(value)
+        super()._store(dependency, (reference, creation_kwargs))
+
+
+class _StrongReference:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
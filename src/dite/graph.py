@@ -0,0 +1,29 @@
+from .dependency import Dependency
+from .factories import Nested
+
+
+def iter_injectors(injector, path=()):
+    yield path, injector
+    for name, factory in injector.__di_factories__.items():
+        if isinstance(factory, Nested):
+            yield from iter_injectors(factory.injector(injector), path + (name,))
+
+
+def direct_dependencies(target):
+    _, unsatisfied = target.factory.prepare({}, target)
+    return unsatisfied
+
+
+def iter_attributes(injector, factory_type):
+    for injector_path, current in iter_injectors(injector):
+        for name, factory in current.__di_factories__.items():
+            if isinstance(factory, factory_type):
+                yield ".".join(injector_path + (name,)), Dependency(current, name)
+
+
+def reaches(target, dependencies, memo):
+    if target in dependencies:
+        return True
+    if target not in memo:
+        memo[target] = any(reaches(current, dependencies, memo) for current in direct_dependencies(target))
+    return memo[target]
@@ -1,8 +1,12 @@
-from .cache_storage import DictCacheStorage
+import inspect
+
+from .cache_storage import ScopedCacheStorage, DictCacheStorage, create_storage
 from .dependency import Dependency
 from .exceptions import DependencyError, AttributeModificationError, UnknownDirectAttributeError
 from .factories import get_factory
-from .builder import build
+from .factories.value import Operation
+from .builder import abuild, build_in_parallel
+from .session import build_in_session
 from .validation import validate
 
 
@@ -15,7 +19,7 @@ def _pull_factories(cls):
 
 
 class InjectorMeta(type):
-    def __new__(mcs, name, bases, namespace, abstract=False):
+    def __new__(mcs, name, bases, namespace, abstract=False, storage=None):
         for parent in bases:
             if not issubclass(parent, Injector):
                 raise DependencyError("Injector subclass cannot inherit regular python classes")
@@ -28,23 +32,41 @@ class InjectorMeta(type):
         cls = super().__new__(mcs, name, bases, namespace)
         cls.__di_own_factories__ = factories
         cls.__di_abstract__ = abstract
+        if storage is not None:
+            cls.__di_storage__ = storage
         _pull_factories(cls)
         mcs._finish_construction(cls)
         if not abstract:
             validate(cls)
+            from .factories.pooled_value import validate_pooled_values
+            validate_pooled_values(cls)
         return cls
 
     def _finish_construction(cls):
-        cls.__di_cache__ = DictCacheStorage()
+        cls.__di_cache__ = create_storage(cls, cls.__di_storage__)
+        if isinstance(cls.__di_cache__, ScopedCacheStorage):
+            raise DependencyError("Usual injectors are disallowed to have ScopedCacheStorage storage")
+        from .factories.async_value import AsyncValue
+        from .factories.cached_value import CachedValue
         from .factories.dynamic_value import DynamicValueFactory
+        from .factories.value import Value
         for attr, value in cls.__di_factories__.items():
             if isinstance(value, DynamicValueFactory):
                 raise DependencyError(f"Usual injector are disallowed to have dynamic values ({attr}).")
+            if isinstance(value, CachedValue) and value.prefetch:
+                raise DependencyError(f"Usual injector are disallowed to have prefetched cached values ({attr}).")
+            # a resource built on every access would be released only on shutdown()
+            if type(value) in (Value, AsyncValue) and not value.deferred and (
+                    value.is_generator or inspect.isasyncgenfunction(value.function)):
+                raise DependencyError(f"Usual injector are disallowed to have not cached generator values ({attr}).")
 
     def __getattr__(self, attr):
         dependency = Dependency(self, attr)
         raise UnknownDirectAttributeError(dependency)
 
+    async def aget(cls, attr):
+        return await aresolve(cls, attr)
+
     def __setattr__(cls, attrname, value):
         if not (attrname.startswith('__di_') and attrname.endswith('__')):
             raise AttributeModificationError()
@@ -54,7 +76,7 @@ class InjectorMeta(type):
         raise AttributeModificationError()
 
 
-class Injector(metaclass=InjectorMeta, abstract=True):
+class Injector(metaclass=InjectorMeta, abstract=True, storage=DictCacheStorage):
     def __init__(self, parent):
         self.__di_parent__ = parent
 
@@ -65,8 +87,35 @@ class BuildEntryPoint:
 
     def __get__(self, instance, owner):
         injector = instance or owner
-        if injector.__di_abstract__:
-            raise DependencyError(
-                "Direct abstract injector usage is disallowed. Use a concrete injector inherited from the abstract one."
-            )
-        return build(Dependency(injector, self.name))
+        _check_concrete(injector)
+        dependency = Dependency(injector, self.name)
+        return build_in_session(dependency)
+
+
+def resolve(injector, attr, executor=None, max_in_flight=None):
+    _check_concrete(injector)
+    dependency = Dependency(injector, attr)
+    if executor is None:
+        return build_in_session(dependency)
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError("max_in_flight should be a positive integer")
+    return build_in_parallel(dependency, executor, max_in_flight)
+
+
+def map_operation(injector, attr, iterable, **options):
+    operation = resolve(injector, attr)
+    if not isinstance(operation, Operation):
+        raise DependencyError(f"'{Dependency(injector, attr)}' is not an operation")
+    return operation.map(iterable, **options)
+
+
+async def aresolve(injector, attr):
+    _check_concrete(injector)
+    return await abuild(Dependency(injector, attr))
+
+
+def _check_concrete(injector):
+    if injector.__di_abstract__:
+        raise DependencyError(
+            "Direct abstract injector usage is disallowed. Use a concrete injector inherited from the abstract one."
+        )
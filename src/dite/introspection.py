@@ -6,6 +6,15 @@ from .exceptions import (
 )
 
 
+class _LazyDependency:
+    # the default value of the parameters to be injected lazily
+    def __repr__(self):
+        return 'lazy_dependency'
+
+
+lazy_dependency = _LazyDependency()
+
+
 def inspect_method_args(func):
     return inspect_function_args(func)[1:]
 
@@ -19,13 +28,24 @@ def inspect_function_args(func):
     for name, param in signature(func).parameters.items():
         is_required = param.default is param.empty
         args.append((name, is_required))
-        if param.default is not param.empty:
+        if param.default is not param.empty and not _is_lazy_marker(param.default):
             _validate_default_value(name, param.default, func)
         if param.kind not in {param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY}:
             raise WrongParameterTypeError(param.kind)
     return args
 
 
+def inspect_lazy_args(func):
+    # the parameters having 'lazy_dependency' default value get a proxy building the dependency on the first usage
+    if func is object.__init__:
+        return frozenset()
+    return frozenset(name for name, param in signature(func).parameters.items() if _is_lazy_marker(param.default))
+
+
+def _is_lazy_marker(default_value):
+    return default_value is lazy_dependency
+
+
 def _validate_default_value(parameter_name, default_value, owner):
     is_class_expected = parameter_name.endswith("_class")
     is_class_provided = isclass(default_value)
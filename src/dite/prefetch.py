@@ -0,0 +1,168 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+
+from .dependency import Dependency
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_prefetching = ContextVar('dite.prefetching', default=None)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix='dite-prefetch')
+        return _executor
+
+
+def _forget_executor():
+    global _executor
+    # the threads of the executor don't exist in a forked child process
+    _executor = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+
+class PendingEntry:
+    # is stored in the scope cache instead of the cached value while the value is being prefetched
+    def __init__(self):
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._claimed = False
+
+    def claim(self):
+        # the value is built by whoever claims the entry first: the prefetching job or a waiting thread
+        with self._lock:
+            if self._claimed:
+                return False
+            self._claimed = True
+            return True
+
+    def wait(self, dependency):
+        if _prefetching.get() is self:
+            # the prefetching thread builds the value itself
+            return None
+        if self.claim():
+            # the job hasn't started (e.g. all the workers wait for other values), so it isn't waited for
+            _build(dependency, self)
+        else:
+            self._done.wait()
+        entry = dependency.get_from_cache()
+        if entry is self:
+            # prefetching failed or was cancelled, the value is built by the caller
+            return None
+        return entry
+
+    def finish(self):
+        self._done.set()
+
+    def join(self):
+        self._done.wait()
+
+    def is_finished(self):
+        return self._done.is_set()
+
+
+def start_prefetch(injector):
+    prefetches = []
+    cache = injector.__di_cache__
+    for attr in injector.__di_prefetch__:
+        if attr in cache:
+            continue
+        entry = PendingEntry()
+        cache[attr] = entry
+        context = copy_context()
+        future = _get_executor().submit(context.run, _prefetch, Dependency(injector, attr), entry)
+        prefetches.append((future, entry))
+    return prefetches
+
+
+def cancel_prefetch(prefetches):
+    # the started builds are waited for, so the resources they register are released with the scope
+    for entry in _cancel(prefetches):
+        entry.join()
+
+
+async def acancel_prefetch(prefetches):
+    loop = asyncio.get_running_loop()
+    for entry in _cancel(prefetches):
+        if not entry.is_finished():
+            await loop.run_in_executor(None, entry.join)
+
+
+def _cancel(prefetches):
+    # an entry claimed by a waiting thread is finished by that thread
+    for future, entry in prefetches:
+        if future.cancel() and entry.claim():
+            entry.finish()
+    return [entry for _, entry in prefetches]
+
+
+def _prefetch(dependency, entry):
+    if entry.claim():
+        _build(dependency, entry)
+
+
+def _build(dependency, entry):
+    from .builder import build
+    token = _prefetching.set(entry)
+    try:
+        build(dependency)
+    finally:
+        _prefetching.reset(token)
+        entry.finish()
+
+
+def start_aprefetch(injector):
+    # the async values are prefetched by asyncio tasks, when the scope is entered with 'async with'
+    from .builder import abuild
+    tasks = []
+    cache = injector.__di_cache__
+    for attr in injector.__di_aprefetch__:
+        if attr in cache:
+            continue
+        task = asyncio.ensure_future(abuild(Dependency(injector, attr)))
+        task.add_done_callback(_retrieve_error)
+        tasks.append((attr, task))
+    return tasks
+
+
+def _retrieve_error(task):
+    # the failed value is built again on the access, which raises the error
+    if not task.cancelled():
+        task.exception()
+
+
+def cancel_aprefetch(tasks):
+    for _, task in tasks:
+        task.cancel()
+
+
+async def acancel_aprefetch(injector, tasks):
+    from .factories.async_value import _Flight
+    cancel_aprefetch(tasks)
+    await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+    # the build shared with the accesses is shielded from the cancellation of the prefetching task
+    cache = injector.__di_cache__
+    flights = [cache[attr].task for attr, _ in tasks if attr in cache and isinstance(cache[attr], _Flight)]
+    for flight in flights:
+        flight.cancel()
+    await asyncio.gather(*flights, return_exceptions=True)
+
+
+def init_prefetched_values(injector):
+    from .factories.cached_value import CachedValue
+    from .factories.factory import AsyncFactory
+    prefetched = [
+        (attr, factory) for attr, factory in injector.__di_factories__.items()
+        if isinstance(factory, CachedValue) and factory.prefetch
+    ]
+    injector.__di_prefetch__ = tuple(attr for attr, factory in prefetched if not isinstance(factory, AsyncFactory))
+    injector.__di_aprefetch__ = tuple(attr for attr, factory in prefetched if isinstance(factory, AsyncFactory))
@@ -0,0 +1,135 @@
+import functools
+import itertools
+import os
+import threading
+
+from .exceptions import DependencyError
+
+
+CLEANUPS_KEY = '__di_cleanups__'
+_sequence = itertools.count()
+_lock = threading.Lock()
+
+
+def enter_generator(dependency, generator):
+    value = next(generator)
+    _register_cleanup(dependency, functools.partial(_close_generator, generator), generator.close, is_async=False)
+    return value
+
+
+async def enter_async_generator(dependency, generator):
+    value = await generator.__anext__()
+    _register_cleanup(dependency, functools.partial(_close_async_generator, generator), None, is_async=True)
+    return value
+
+
+def register_cleanup(dependency, cleanup):
+    _register_cleanup(dependency, cleanup, None, is_async=False)
+
+
+def _register_cleanup(dependency, cleanup, close, is_async):
+    cache = dependency.injector_type.__di_cache__
+    # the resources of fork unsafe values are released by the process which has built them only
+    owner_pid = None if getattr(dependency.factory, 'fork_safe', True) else os.getpid()
+    try:
+        with _lock:
+            if CLEANUPS_KEY not in cache:
+                cache[CLEANUPS_KEY] = []
+            cleanups = cache[CLEANUPS_KEY]
+    except LookupError:
+        if close is not None:
+            close()
+        raise DependencyError("resource values are disallowed when there is no active scope")
+    cleanups.append((next(_sequence), owner_pid, cleanup, is_async))
+
+
+def _close_generator(generator):
+    try:
+        next(generator)
+    except StopIteration:
+        return
+    generator.close()
+    raise RuntimeError("generator didn't stop")
+
+
+async def _close_async_generator(generator):
+    try:
+        await generator.__anext__()
+    except StopAsyncIteration:
+        return
+    await generator.aclose()
+    raise RuntimeError("generator didn't stop")
+
+
+def _pop_cleanups(cache):
+    if CLEANUPS_KEY not in cache:
+        return []
+    cleanups = cache[CLEANUPS_KEY]
+    cache[CLEANUPS_KEY] = []
+    pid = os.getpid()
+    return [entry for entry in cleanups if entry[1] is None or entry[1] == pid]
+
+
+def _run(cleanups):
+    errors = []
+    for _, _, cleanup, is_async in sorted(cleanups, key=lambda entry: entry[0], reverse=True):
+        try:
+            if is_async:
+                raise DependencyError("async resources should be released with 'async with' or 'ashutdown()'")
+            cleanup()
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+async def _arun(cleanups):
+    errors = []
+    for _, _, cleanup, is_async in sorted(cleanups, key=lambda entry: entry[0], reverse=True):
+        try:
+            if is_async:
+                await cleanup()
+            else:
+                cleanup()
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
+
+def run_cleanups(cache):
+    _run(_pop_cleanups(cache))
+
+
+async def arun_cleanups(cache):
+    await _arun(_pop_cleanups(cache))
+
+
+def shutdown(injector):
+    caches = _collect_caches(injector)
+    try:
+        _run([entry for cache in caches for entry in _pop_cleanups(cache)])
+    finally:
+        for cache in caches:
+            cache.clear()
+
+
+async def ashutdown(injector):
+    caches = _collect_caches(injector)
+    try:
+        await _arun([entry for cache in caches for entry in _pop_cleanups(cache)])
+    finally:
+        for cache in caches:
+            cache.clear()
+
+
+def _collect_caches(injector):
+    from .cache_storage import ScopedCacheStorage
+    from .graph import iter_injectors
+    caches = {}
+    for _, current in iter_injectors(injector):
+        cache = (current if isinstance(current, type) else type(current)).__di_cache__
+        # the resources of scoped injectors are released when the scope stops
+        if not isinstance(cache, ScopedCacheStorage):
+            caches[id(cache)] = cache
+    return list(caches.values())
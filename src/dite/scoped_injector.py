@@ -1,57 +1,249 @@
-from .cache_storage import ContextVarCacheStorage
+from .cache_storage import ScopedCacheStorage, ContextVarCacheStorage, create_storage
+from .dependency import Dependency
 from .exceptions import DependencyError
 from .factories.dynamic_value import init_dynamic_values
+from .graph import reaches
 from .injector import Injector, InjectorMeta
+from .prefetch import (
+    PendingEntry, init_prefetched_values, start_prefetch, cancel_prefetch, acancel_prefetch, start_aprefetch,
+    cancel_aprefetch, acancel_aprefetch,
+)
+from .resources import run_cleanups, arun_cleanups
 
 
 class ScopedInjectorMeta(InjectorMeta):
     def _finish_construction(cls):
-        cls.__di_cache__ = ContextVarCacheStorage(cls.__qualname__)
+        cls.__di_cache__ = create_storage(cls, cls.__di_storage__)
+        if not isinstance(cls.__di_cache__, ScopedCacheStorage):
+            raise DependencyError("Scoped injectors are allowed to have ScopedCacheStorage storage only")
         init_dynamic_values(cls)
+        init_prefetched_values(cls)
 
 
-class ScopedInjector(Injector, metaclass=ScopedInjectorMeta, abstract=True):
+class ScopedInjector(Injector, metaclass=ScopedInjectorMeta, abstract=True, storage=ContextVarCacheStorage):
     pass
 
 
 def begin_scope(injector, **kwargs):
+    injector = _get_scoped_injector(injector, "begin_scope()")
+    _check_dynamic_values(injector, kwargs, "begin_scope()")
+    return Scope(injector, kwargs)
+
+
+def begin_scopes(scopes):
+    injectors = []
+    seen = set()
+    for injector, values in scopes.items():
+        injector = _get_scoped_injector(injector, "begin_scopes()")
+        if injector in seen:
+            raise DependencyError(f"begin_scopes() got the injector {injector.__qualname__} more than once")
+        seen.add(injector)
+        _check_dynamic_values(injector, values, "begin_scopes()")
+        injectors.append((injector, values))
+    return ScopeStack(injectors)
+
+
+def scope_template(injector):
+    injector = _get_scoped_injector(injector, "scope_template()")
+    return ScopeTemplate(injector)
+
+
+def _get_scoped_injector(injector, function_name):
     if not isinstance(injector, type):
         injector = type(injector)
     if not issubclass(injector, ScopedInjector):
-        raise DependencyError("begin_scope() should be applied to ScopedInjector subclass")
+        raise DependencyError(f"{function_name} should be applied to ScopedInjector subclass")
+    return injector
+
+
+def _check_dynamic_values(injector, kwargs, function_name):
     expected_values = injector.__di_dynamic_values__
     actual_values = kwargs.keys()
     missing = expected_values - actual_values
     extra = actual_values - expected_values
     if missing:
-        message = "begin_scope() didn't get dynamic values which are required for the injector: {}."
-        raise DependencyError(message.format(", ".join(sorted(missing))))
+        message = "{} didn't get dynamic values which are required for the injector: {}."
+        raise DependencyError(message.format(function_name, ", ".join(sorted(missing))))
     if extra:
-        message = "begin_scope() got dynamic values which are unknown to the injector: {}."
-        raise DependencyError(message.format(", ".join(sorted(extra))))
-    return Scope(injector.__di_cache__, kwargs)
+        message = "{} got dynamic values which are unknown to the injector: {}."
+        raise DependencyError(message.format(function_name, ", ".join(sorted(extra))))
+
+
+class ScopeTemplate(object):
+    def __init__(self, injector):
+        self.injector = injector
+        self.cache = injector.__di_cache__
+
+    def enter(self, **values):
+        # a single comparison is enough on the happy path, the detailed check is done only to report an error
+        if values.keys() != self.injector.__di_dynamic_values__:
+            _check_dynamic_values(self.injector, values, "ScopeTemplate.enter()")
+        return Scope(self.injector, values)
+
+
+def _start_scope(injector, values):
+    token = injector.__di_cache__.start(values)
+    prefetches = start_prefetch(injector) if injector.__di_prefetch__ else None
+    return token, prefetches
+
+
+def _stop_scope(injector, state):
+    token, prefetches = state
+    if prefetches:
+        cancel_prefetch(prefetches)
+    try:
+        run_cleanups(injector.__di_cache__)
+    finally:
+        injector.__di_cache__.stop(token)
+
+
+async def _astop_scope(injector, state):
+    token, prefetches = state
+    if prefetches:
+        await acancel_prefetch(prefetches)
+    try:
+        await arun_cleanups(injector.__di_cache__)
+    finally:
+        injector.__di_cache__.stop(token)
+
+
+class ScopeStack(object):
+    def __init__(self, scopes):
+        self.scopes = scopes
+        self.started = False
+        self.states = None
+        self.aprefetches = None
+
+    def start(self):
+        if self.started:
+            raise RuntimeError("ScopeStack.start() should be called only once")
+        states = []
+        try:
+            for injector, values in self.scopes:
+                states.append(_start_scope(injector, values))
+        except BaseException:
+            self._stop(states)
+            raise
+        self.states = states
+        self.started = True
+
+    def stop(self):
+        if not self.started:
+            return
+        states, self.states, self.started = self.states, None, False
+        for _, tasks in self.aprefetches or ():
+            cancel_aprefetch(tasks)
+        self.aprefetches = None
+        self._stop(states)
+
+    async def astop(self):
+        if not self.started:
+            return
+        states, self.states, self.started = self.states, None, False
+        aprefetches, self.aprefetches = self.aprefetches or (), None
+        errors = []
+        for injector, tasks in reversed(aprefetches):
+            await acancel_aprefetch(injector, tasks)
+        for (injector, _), state in reversed(list(zip(self.scopes, states))):
+            try:
+                await _astop_scope(injector, state)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def _stop(self, states):
+        errors = []
+        for (injector, _), state in reversed(list(zip(self.scopes, states))):
+            try:
+                _stop_scope(injector, state)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    async def __aenter__(self):
+        self.start()
+        self.aprefetches = [
+            (injector, start_aprefetch(injector)) for injector, _ in self.scopes if injector.__di_aprefetch__
+        ]
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.astop()
 
 
 class Scope(object):
-    def __init__(self, cache, values):
-        self.cache = cache
+    def __init__(self, injector, values, fork_unsafe=()):
+        self.injector = injector
+        self.cache = injector.__di_cache__
         self.values = values
+        # the keys of the values inherited by a forked scope which are discarded on fork
+        self.fork_unsafe = fork_unsafe
         self.started = False
-        self.token = None
+        self.state = None
+        # the content of this scope, forks read it from any thread or context
+        self.storage = None
+        self.aprefetches = None
 
     def start(self):
         if self.started:
             raise RuntimeError("Scope.start() should be called only once")
-        self.token = self.cache.start()
+        self.state = _start_scope(self.injector, self.values)
+        self.storage = self.cache.active_scope()
+        for key in self.fork_unsafe:
+            self.cache.discard_on_fork(key)
         self.started = True
-        for k, v in self.values.items():
-            self.cache[k] = v
 
     def stop(self):
         if not self.started:
             return
-        self.cache.stop(self.token)
-        self.started = False
+        state, self.state, self.storage, self.started = self.state, None, None, False
+        if self.aprefetches:
+            cancel_aprefetch(self.aprefetches)
+        self.aprefetches = None
+        _stop_scope(self.injector, state)
+
+    async def astop(self):
+        if not self.started:
+            return
+        state, self.state, self.storage, self.started = self.state, None, None, False
+        aprefetches, self.aprefetches = self.aprefetches, None
+        try:
+            if aprefetches:
+                await acancel_aprefetch(self.injector, aprefetches)
+        finally:
+            await _astop_scope(self.injector, state)
+
+    def fork(self, **values):
+        if not self.started:
+            raise RuntimeError("Scope.fork() should be called on a started scope")
+        extra = values.keys() - self.injector.__di_dynamic_values__
+        if extra:
+            message = "Scope.fork() got dynamic values which are unknown to the injector: {}."
+            raise DependencyError(message.format(", ".join(sorted(extra))))
+        overridden = {Dependency(self.injector, attr) for attr in values}
+        memo = {}
+        entries = {}
+        # the forked scope shares the entries of this scope, except for the ones built from the overridden values
+        for attr, entry in self.cache.snapshot(self.storage).items():
+            # the resources are released by the scope which has built them,
+            # the other internal entries (e.g. the checked out shards) belong to the scope too
+            if isinstance(entry, PendingEntry) or attr.startswith('__di_'):
+                continue
+            is_dynamic_value = attr in self.injector.__di_dynamic_values__
+            if is_dynamic_value or not reaches(Dependency(self.injector, attr), overridden, memo):
+                entries[attr] = entry
+        entries.update(values)
+        fork_unsafe = self.cache.fork_unsafe_keys(self.storage) & (entries.keys() - values.keys())
+        return Scope(self.injector, entries, fork_unsafe)
 
     def __enter__(self):
         self.start()
@@ -59,3 +251,12 @@ class Scope(object):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.stop()
+
+    async def __aenter__(self):
+        self.start()
+        if self.injector.__di_aprefetch__:
+            self.aprefetches = start_aprefetch(self.injector)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.astop()
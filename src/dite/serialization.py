@@ -0,0 +1,168 @@
+import array
+import hashlib
+import inspect
+import pickle
+import struct
+
+from .exceptions import DependencyError
+
+
+# pickle protocol 5 is required to store buffers (e.g. NumPy arrays) out-of-band
+PROTOCOL = 5
+ALIGNMENT = 64
+
+_RAW, _PICKLED = 0, 1
+_LENGTH = struct.Struct("<Q")
+_RAW_TYPES = (bytes, bytearray, array.array)
+
+
+def fingerprint(dependency, function, kwargs, key=None):
+    digest = hashlib.sha256()
+    if key is not None:
+        digest.update(key.encode())
+        return digest.hexdigest()
+    try:
+        _update_with_function(digest, function, kwargs)
+    except Exception as e:
+        message = f"Cannot fingerprint the dependencies of '{dependency}', provide the 'key' explicitly ({e})."
+        raise DependencyError(message) from e
+    return digest.hexdigest()
+
+
+def _update_with_function(digest, function, kwargs):
+    digest.update(f"{function.__module__}.{function.__qualname__}".encode())
+    if inspect.isclass(function):
+        function = function.__init__
+    code = getattr(function, '__code__', None)
+    if code is not None:
+        _update_with_code(digest, code)
+    digest.update(_canonical(kwargs, set()))
+
+
+def _update_with_code(digest, code):
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            _update_with_code(digest, const)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode())
+        else:
+            digest.update(repr(const).encode())
+
+
+_SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _canonical(value, in_progress):
+    # unlike pickle, doesn't depend on the order of the set elements, which differs between processes
+    kind = type(value)
+    if kind in _SCALAR_TYPES:
+        return f"{kind.__name__}:{value!r}".encode()
+    if isinstance(value, type) or inspect.isfunction(value) or _is_module_builtin(value):
+        return b"global:" + _global_name(value).encode()
+    if inspect.ismodule(value):
+        raise TypeError(f"module {value.__name__!r} can not be fingerprinted")
+    if id(value) in in_progress:
+        raise TypeError(f"recursive {kind.__name__!r} value can not be fingerprinted")
+    in_progress.add(id(value))
+    try:
+        if kind in (tuple, list):
+            return _join(kind.__name__, [_canonical(item, in_progress) for item in value])
+        if kind is dict:
+            items = (_join('item', [_canonical(k, in_progress), _canonical(v, in_progress)]) for k, v in value.items())
+            return _join('dict', sorted(items))
+        if kind in (set, frozenset):
+            return _join(kind.__name__, sorted(_canonical(item, in_progress) for item in value))
+        return _canonical_reduced(value, in_progress)
+    finally:
+        in_progress.discard(id(value))
+
+
+def _canonical_reduced(value, in_progress):
+    # the other objects are encoded the way pickle reconstructs them: a callable, its arguments and the state
+    reduced = value.__reduce_ex__(4)
+    if isinstance(reduced, str):
+        return b"global:" + reduced.encode()
+    function, args, *rest = reduced
+    parts = [_canonical(function, in_progress), _canonical(args, in_progress)]
+    state, list_items, dict_items = (rest + [None] * 3)[:3]
+    parts.append(_canonical(state, in_progress))
+    parts.append(_canonical(None if list_items is None else list(list_items), in_progress))
+    parts.append(_canonical(None if dict_items is None else list(dict_items), in_progress))
+    return _join('object', parts)
+
+
+def _is_module_builtin(value):
+    # e.g. len, unlike the bound methods of the builtin types
+    return inspect.isbuiltin(value) and inspect.ismodule(getattr(value, '__self__', None))
+
+
+def _global_name(value):
+    qualname = getattr(value, '__qualname__', None)
+    module = getattr(value, '__module__', None)
+    if qualname is None or module is None or '<' in qualname:
+        raise TypeError(f"{value!r} is not importable, so it can not be fingerprinted")
+    return f"{module}.{qualname}"
+
+
+def _join(tag, parts):
+    # the length prefixes keep the encoding unambiguous
+    return b"".join([tag.encode(), b"["] + [_LENGTH.pack(len(part)) + part for part in parts] + [b"]"])
+
+
+def serialize(value):
+    # layout: <meta length><meta><padding><payload><padding><buffer>...
+    # the buffers are aligned, so they can be used in place (e.g. by NumPy) when the data is memory-mapped
+    if isinstance(value, _RAW_TYPES):
+        view = memoryview(value)
+        kind, item_format = _RAW, view.format
+        chunks = [view.cast('B')]
+    else:
+        buffers = []
+        payload = pickle.dumps(value, protocol=PROTOCOL, buffer_callback=buffers.append)
+        kind, item_format = _PICKLED, None
+        chunks = [memoryview(payload)] + [buffer.raw() for buffer in buffers]
+    spans = []
+    offset = 0
+    for chunk in chunks:
+        spans.append((offset, chunk.nbytes))
+        offset = _align(offset + chunk.nbytes)
+    meta = pickle.dumps((kind, item_format, spans), protocol=PROTOCOL)
+    data_start = _align(_LENGTH.size + len(meta))
+    parts = [(0, _LENGTH.pack(len(meta))), (_LENGTH.size, meta)]
+    parts.extend((data_start + span_offset, chunk) for (span_offset, _), chunk in zip(spans, chunks))
+    size = data_start + (spans[-1][0] + spans[-1][1] if spans else 0)
+    return size, parts
+
+
+def write(parts, file):
+    position = 0
+    for offset, data in parts:
+        file.write(b"\0" * (offset - position))
+        file.write(data)
+        position = offset + memoryview(data).nbytes
+
+
+def write_into(parts, buffer):
+    for offset, data in parts:
+        data = memoryview(data).cast('B')
+        buffer[offset:offset + data.nbytes] = data
+
+
+def deserialize(buffer):
+    # raw values are returned as read-only memoryview of the buffer,
+    # out-of-band buffers of pickled objects refer to the buffer as well
+    buffer = memoryview(buffer).toreadonly()
+    meta_length, = _LENGTH.unpack_from(buffer, 0)
+    meta_end = _LENGTH.size + meta_length
+    kind, item_format, spans = pickle.loads(buffer[_LENGTH.size:meta_end])
+    data_start = _align(meta_end)
+    views = [buffer[data_start + offset:data_start + offset + length] for offset, length in spans]
+    if kind == _RAW:
+        view = views[0]
+        return view if item_format == 'B' else view.cast(item_format)
+    return pickle.loads(views[0], buffers=views[1:])
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
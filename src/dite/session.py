@@ -0,0 +1,86 @@
+from contextvars import ContextVar
+
+from .builder import build
+from .exceptions import DependencyError
+
+
+_current_session = ContextVar('dite.session', default=None)
+
+
+def session(injector):
+    if not isinstance(injector, type):
+        injector = type(injector)
+    if injector.__di_abstract__:
+        raise DependencyError("session() should be applied to a concrete injector")
+    return Session(injector)
+
+
+def build_in_session(dependency):
+    # the active session is used if the dependency belongs to the injector of the session
+    current = _current_session.get()
+    if current is None or dependency.injector_type not in current.injectors:
+        return build(dependency)
+    return current.build(dependency)
+
+
+class Session(object):
+    def __init__(self, injector):
+        self.injector = injector
+        self.injectors = None
+        self.built_values = None
+        self.started = False
+        self.token = None
+        self._context_bound = {}
+
+    def start(self):
+        if self.started:
+            raise RuntimeError("Session.start() should be called only once")
+        from .graph import iter_injectors
+        self.injectors = {
+            current if isinstance(current, type) else type(current) for _, current in iter_injectors(self.injector)
+        }
+        self.built_values = {}
+        self.token = _current_session.set(self)
+        self.started = True
+
+    def stop(self):
+        if not self.started:
+            return
+        _current_session.reset(self.token)
+        self.token = self.built_values = None
+        self._context_bound = {}
+        self.started = False
+
+    def build(self, dependency):
+        built_values = dict(self.built_values)
+        result = build(dependency, built_values)
+        # the values which differ between threads, contexts and scopes are not shared
+        for target, value in built_values.items():
+            if target not in self.built_values and not self._is_context_bound(target):
+                self.built_values.setdefault(target, value)
+        return result
+
+    def _is_context_bound(self, target):
+        from .graph import direct_dependencies
+        # the graph has no cycles, they are reported when the injector is created
+        if target not in self._context_bound:
+            self._context_bound[target] = _is_context_value(target) or any(
+                self._is_context_bound(current) for current in direct_dependencies(target)
+            )
+        return self._context_bound[target]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def _is_context_value(dependency):
+    from .cache_storage import ScopedCacheStorage
+    from .factories.dynamic_value import DynamicValueFactory
+    from .factories.thread_local_cached_value import ThreadLocalCachedValue
+    if isinstance(dependency.injector_type.__di_cache__, ScopedCacheStorage):
+        return True
+    return isinstance(dependency.factory, (DynamicValueFactory, ThreadLocalCachedValue))
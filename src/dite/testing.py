@@ -1,7 +1,9 @@
-from . import ScopedInjector
+from . import Injector, ScopedInjector, cached_value
+from .cache_storage import ScopedCacheStorage
 from .exceptions import DependencyError
 from .factories import get_factory
 from .factories.dynamic_value import init_dynamic_values
+from .prefetch import init_prefetched_values
 
 
 def override_factories(injector, **kwargs):
@@ -25,6 +27,7 @@ class Patcher(object):
         self._old_factories = None
         self._old_own_factories = None
         self._old_dynamic_values = None
+        self._old_prefetched_values = None
 
     def start(self):
         if self._started:
@@ -39,7 +42,9 @@ class Patcher(object):
                 self._injector.__di_own_factories__[attr_name] = factory
         if self._is_scoped:
             self._old_dynamic_values = self._injector.__di_dynamic_values__
+            self._old_prefetched_values = self._injector.__di_prefetch__, self._injector.__di_aprefetch__
             init_dynamic_values(self._injector)
+            init_prefetched_values(self._injector)
         self._started = True
 
     def stop(self):
@@ -50,7 +55,8 @@ class Patcher(object):
         self._old_factories = self._old_own_factories = None
         if self._is_scoped:
             self._injector.__di_dynamic_values__ = self._old_dynamic_values
-            self._old_dynamic_values = None
+            self._injector.__di_prefetch__, self._injector.__di_aprefetch__ = self._old_prefetched_values
+            self._old_dynamic_values = self._old_prefetched_values = None
         self._started = False
 
     def __enter__(self):
@@ -59,3 +65,96 @@ class Patcher(object):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.stop()
+
+
+def check_cache_storage(storage_class):
+    """
+    Checks that a custom storage conforms to the CacheStorage/ScopedCacheStorage protocol,
+    raises AssertionError otherwise.
+    """
+    is_scoped = issubclass(storage_class, ScopedCacheStorage)
+    base = ScopedInjector if is_scoped else Injector
+
+    class Container(base, storage=storage_class):
+        value = cached_value(object)
+
+    storage = Container.__di_cache__
+    checker = _StorageChecker(storage_class.__name__)
+    if is_scoped:
+        _check_scoped_cache_storage(storage, checker)
+    else:
+        _check_content(storage, checker)
+        _check_clear(storage, checker)
+        checker.expect(storage.is_active, "is_active should be true")
+
+
+def _check_scoped_cache_storage(storage, checker):
+    checker.expect(not storage.is_active, "is_active should be false when there is no active scope")
+    checker.expect('user' not in storage, "'in' should be false when there is no active scope")
+    checker.raises(LookupError, lambda: storage['user'], "reading without an active scope")
+    checker.raises(LookupError, lambda: storage.__setitem__('user', 'alice'), "writing without an active scope")
+
+    values = {'user': 'alice'}
+    token = storage.start(values)
+    checker.expect(storage.is_active, "is_active should be true when there is an active scope")
+    checker.expect(storage['user'] == 'alice', "start() should store the given values")
+    _check_content(storage, checker)
+    checker.expect(values == {'user': 'alice'}, "start() should not modify the given values")
+    snapshot = storage.snapshot()
+    checker.expect(snapshot.get('user') == 'alice', "snapshot() should contain the stored values")
+    snapshot['user'] = 'ben'
+    checker.expect(storage['user'] == 'alice', "snapshot() should return a copy")
+    scope = storage.active_scope()
+
+    inner_token = storage.start()
+    checker.expect('user' not in storage, "the nested scope should be empty")
+    storage['user'] = 'ben'
+    checker.expect(storage.snapshot(scope).get('user') == 'alice', "snapshot(scope) should read the given scope")
+    storage.stop(inner_token)
+    checker.expect(storage['user'] == 'alice', "stop() should restore the outer scope")
+    _check_clear(storage, checker)
+
+    storage.stop(token)
+    checker.expect(not storage.is_active, "stop() should deactivate the scope")
+
+
+def _check_content(storage, checker):
+    first, second = object(), object()
+    checker.expect('value' not in storage, "'in' should be false for a missing key")
+    checker.raises(KeyError, lambda: storage['value'], "reading a missing key")
+    storage['value'] = first
+    checker.expect('value' in storage, "'in' should be true for a stored key")
+    key = storage.attr_keys.get('value', 'value')
+    checker.expect(key in storage and storage[key] is first, "attr_keys should refer to the stored attribute")
+    checker.expect(storage['value'] is first, "the stored value should be returned")
+    storage['value'] = second
+    checker.expect(storage['value'] is second, "the stored value should be replaced")
+    storage['other'] = first
+    storage.discard_on_fork('value')
+    storage.discard_fork_unsafe_values()
+    checker.expect('value' not in storage, "discard_fork_unsafe_values() should remove fork unsafe values")
+    checker.expect(storage['other'] is first, "discard_fork_unsafe_values() should keep the other values")
+
+
+def _check_clear(storage, checker):
+    storage['value'] = object()
+    storage.clear()
+    checker.expect('value' not in storage, "clear() should remove the stored values")
+
+
+class _StorageChecker:
+    def __init__(self, name):
+        self.name = name
+
+    def expect(self, condition, message):
+        if not condition:
+            raise AssertionError(f"{self.name}: {message}")
+
+    def raises(self, error_class, action, description):
+        try:
+            action()
+        except error_class:
+            return
+        except Exception as e:
+            raise AssertionError(f"{self.name}: {description} should raise {error_class.__name__}, not {e!r}")
+        raise AssertionError(f"{self.name}: {description} should raise {error_class.__name__}")
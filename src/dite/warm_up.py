@@ -0,0 +1,104 @@
+import gc
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextvars import copy_context
+
+from .builder import build
+from .exceptions import DependencyError, NoInjectorParentError
+from .factories.cached_value import CachedValue
+from .factories.thread_local_cached_value import ThreadLocalCachedValue
+from .factories.factory import AsyncFactory
+from .graph import iter_attributes, direct_dependencies, reaches
+
+
+def warm_up(injector, include=None, parallel=None, freeze=True):
+    if not isinstance(injector, type):
+        injector = type(injector)
+    if injector.__di_abstract__:
+        raise DependencyError("warm_up() should be applied to a concrete injector")
+    targets = _collect_targets(injector, include)
+    requirements = {target: _cached_dependencies(target, targets) for target in targets}
+    if parallel is None or parallel <= 1:
+        for target in _sorted(requirements):
+            build(target)
+    else:
+        _build_in_parallel(requirements, parallel)
+    if freeze:
+        gc.freeze()
+
+
+def _collect_targets(injector, include):
+    if include is not None:
+        include = set(include)
+    targets = {}
+    async_values = {target for _, target in iter_attributes(injector, AsyncFactory)}
+    memo = {}
+    for path, target in iter_attributes(injector, CachedValue):
+        # thread local values are built by every thread on its own, there is nothing to share
+        if isinstance(target.factory, ThreadLocalCachedValue):
+            continue
+        try:
+            if reaches(target, async_values, memo):
+                continue
+        except NoInjectorParentError:
+            # refers to the parent of an injector used at the top level, so it can't be built
+            continue
+        if not target.injector_type.__di_cache__.is_active:
+            continue
+        if include is None or _is_included(path, include):
+            targets[target] = path
+    return targets
+
+
+def _is_included(path, include):
+    parts = path.split(".")
+    return any(".".join(parts[:i]) in include for i in range(1, len(parts) + 1))
+
+
+def _cached_dependencies(target, targets):
+    result = set()
+    visited = set()
+    backlog = [target]
+    while backlog:
+        current = backlog.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        if current in targets and current != target:
+            result.add(current)
+            continue
+        try:
+            backlog.extend(direct_dependencies(current))
+        except NoInjectorParentError:
+            pass
+    return result
+
+
+def _sorted(requirements):
+    result = []
+    done = set()
+    pending = dict(requirements)
+    while pending:
+        ready = [target for target, required in pending.items() if required <= done]
+        for target in ready:
+            del pending[target]
+            done.add(target)
+            result.append(target)
+    return result
+
+
+def _build_in_parallel(requirements, parallel):
+    done = set()
+    pending = dict(requirements)
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        while pending or in_flight:
+            ready = [target for target, required in pending.items() if required <= done]
+            for target in ready:
+                del pending[target]
+                future = executor.submit(copy_context().run, build, target)
+                in_flight[future] = target
+            completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                target = in_flight.pop(future)
+                future.result()
+                done.add(target)
@@ -0,0 +1,254 @@
+import asyncio
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, DependencyError, async_value, async_cached_value, aresolve, begin_scope, cached_value,
+    value, this, warm_up,
+)
+from dite.exceptions import AsyncValueAccessError
+
+
+class Settings:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_async_value_is_resolved__coroutine_result_is_returned():
+    class Container(Injector):
+        name = "Alice"
+
+        @async_value
+        async def greeting(name):
+            return f"Hello, {name}"
+
+    assert await aresolve(Container, "greeting") == "Hello, Alice"
+    assert await Container.aget("greeting") == "Hello, Alice"
+
+
+@pytest.mark.asyncio
+async def test_independent_async_values__are_awaited_concurrently():
+    both_started = asyncio.Event()
+    started = []
+
+    async def load(name):
+        started.append(name)
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), 5)
+        return name
+
+    class Container(Injector):
+        @async_value
+        async def cache():
+            return await load("cache")
+
+        @async_value
+        async def database():
+            return await load("database")
+
+        @value
+        def handler(cache, database):
+            return cache, database
+
+    assert await aresolve(Container, "handler") == ("cache", "database")
+
+
+@pytest.mark.asyncio
+async def test_shared_dependency__is_built_once_per_resolution():
+    calls = []
+
+    class Container(Injector):
+        @async_value
+        async def client():
+            calls.append(1)
+            return object()
+
+        @async_value
+        async def first(client):
+            return client
+
+        @async_value
+        async def second(client):
+            return client
+
+        @value
+        def handler(first, second):
+            return first, second
+
+    first, second = await aresolve(Container, "handler")
+    assert first is second
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_cached_value__is_cached():
+    class Container(Injector):
+        @async_cached_value
+        async def client():
+            return object()
+
+    a = await aresolve(Container, "client")
+    b = await aresolve(Container, "client")
+    assert a is b
+
+
+@pytest.mark.asyncio
+async def test_async_cached_value_within_scope__is_cached_per_scope():
+    class Container(ScopedInjector):
+        @async_cached_value
+        async def client():
+            return object()
+
+    async with begin_scope(Container):
+        a = await aresolve(Container, "client")
+        b = await aresolve(Container, "client")
+    async with begin_scope(Container):
+        c = await aresolve(Container, "client")
+
+    assert a is b
+    assert b is not c
+
+
+@pytest.mark.asyncio
+async def test_nested_injector__async_value_is_resolved():
+    class Container(Injector):
+        name = "Alice"
+
+        class Nested(Injector):
+            name = (this << 1).name
+
+            @async_value
+            async def greeting(name):
+                return f"Hello, {name}"
+
+    assert await aresolve(Container.Nested, "greeting") == "Hello, Alice"
+
+
+def test_async_value_is_accessed_synchronously__error_is_raised():
+    class Container(Injector):
+        @async_value
+        async def client():
+            return object()
+
+        @value
+        def handler(client):
+            return client
+
+    with pytest.raises(AsyncValueAccessError, match="Container.client' is an async value.*Container.handler'"):
+        Container.handler
+
+
+@pytest.mark.asyncio
+async def test_async_value_raises__error_is_propagated():
+    class Container(Injector):
+        @async_value
+        async def client():
+            raise ValueError("boom")
+
+        @value
+        def handler(client):
+            return client
+
+    with pytest.raises(ValueError, match="boom"):
+        await aresolve(Container, "handler")
+
+
+def test_async_value_is_used_on_regular_function__error_is_raised():
+    with pytest.raises(DependencyError, match="coroutine and async generator functions only"):
+        async_value(lambda: None)
+    with pytest.raises(DependencyError, match="coroutine and async generator functions only"):
+        async_cached_value(lambda: None)
+
+
+def test_warm_up__async_values_and_their_dependents_are_skipped():
+    class Container(Injector):
+        @async_cached_value
+        async def client():
+            return object()
+
+        @cached_value
+        def handler(client):
+            return client
+
+        settings = cached_value(Settings)
+
+    warm_up(Container, freeze=False)
+
+    assert "settings" in Container.__di_cache__
+    assert "client" not in Container.__di_cache__
+    assert "handler" not in Container.__di_cache__
+
+
+@pytest.mark.asyncio
+async def test_cold_async_cached_value_is_awaited_concurrently__value_is_built_once():
+    calls = []
+
+    class Container(Injector):
+        @async_cached_value
+        async def client():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+    clients = await asyncio.gather(*(aresolve(Container, "client") for _ in range(500)))
+
+    assert len(calls) == 1
+    assert all(client is clients[0] for client in clients)
+
+
+@pytest.mark.asyncio
+async def test_waiter_is_cancelled__build_continues_for_other_waiters():
+    release = asyncio.Event()
+    calls = []
+
+    class Container(ScopedInjector):
+        @async_cached_value
+        async def client():
+            calls.append(1)
+            await release.wait()
+            return "client"
+
+    async with begin_scope(Container):
+        first = asyncio.ensure_future(aresolve(Container, "client"))
+        second = asyncio.ensure_future(aresolve(Container, "client"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "client"
+        assert first.cancelled()
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_cached_value_build_fails__value_is_built_again_on_next_access():
+    calls = []
+
+    class Container(Injector):
+        @async_cached_value
+        async def client():
+            calls.append(1)
+            await asyncio.sleep(0)
+            if len(calls) == 1:
+                raise ConnectionError("handshake failed")
+            return "client"
+
+    results = await asyncio.gather(*(aresolve(Container, "client") for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+    assert await aresolve(Container, "client") == "client"
+    assert await aresolve(Container, "client") == "client"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_cached_value_without_scope__error_is_raised():
+    class Container(ScopedInjector):
+        @async_cached_value
+        async def client():
+            return object()
+
+    with pytest.raises(DependencyError, match="no active scope"):
+        await aresolve(Container, "client")
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, DependencyError, resolve_batch, value, cached_value, dynamic_value, begin_scope,
+)
+
+
+def test_resolve_batch__shared_part_is_built_once():
+    calls = []
+
+    class Container(ScopedInjector):
+        item = dynamic_value
+        environment = dynamic_value
+
+        @cached_value
+        def model(environment):
+            calls.append("model")
+            return f"model-{environment}"
+
+        @value
+        def prepared(item):
+            calls.append("prepared")
+            return item * 2
+
+        @value
+        def process(model, prepared):
+            return model, prepared
+
+    results = resolve_batch(
+        Container, "process", [{"item": i} for i in range(3)], common={"environment": "prod"},
+    )
+
+    assert list(results) == [("model-prod", 0), ("model-prod", 2), ("model-prod", 4)]
+    assert calls.count("model") == 1
+    assert calls.count("prepared") == 3
+
+
+def test_resolve_batch__results_are_streamed():
+    calls = []
+
+    class Container(ScopedInjector):
+        item = dynamic_value
+        environment = dynamic_value
+
+        @cached_value
+        def model(environment):
+            calls.append("model")
+            return f"model-{environment}"
+
+        @value
+        def prepared(item):
+            calls.append("prepared")
+            return item * 2
+
+        @value
+        def process(model, prepared):
+            return model, prepared
+
+    results = resolve_batch(Container, "process", ({"item": i} for i in range(10)), common={"environment": "prod"})
+    assert next(results) == ("model-prod", 0)
+    assert calls == ["model", "prepared"]
+    results.close()
+
+
+def test_resolve_batch_with_executor__results_are_in_order():
+    calls = []
+
+    class Container(ScopedInjector):
+        item = dynamic_value
+        environment = dynamic_value
+
+        @cached_value
+        def model(environment):
+            calls.append("model")
+            return f"model-{environment}"
+
+        @value
+        def prepared(item):
+            calls.append("prepared")
+            return item * 2
+
+        @value
+        def process(model, prepared):
+            return model, prepared
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(resolve_batch(
+            Container, "process", [{"item": i} for i in range(20)], common={"environment": "dev"},
+            executor=executor, chunksize=3, max_in_flight=2,
+        ))
+
+    assert results == [("model-dev", i * 2) for i in range(20)]
+    assert calls.count("model") == 1
+
+
+def test_resolve_batch__caller_scope_is_not_affected():
+    class Container(ScopedInjector):
+        item = dynamic_value
+        environment = dynamic_value
+
+        @cached_value
+        def model(environment):
+            return f"model-{environment}"
+
+        @value
+        def process(model, item):
+            return model, item * 2
+
+    results = resolve_batch(Container, "process", [{"item": 1}, {"item": 2}], common={"environment": "prod"})
+    next(results)
+    assert not Container.__di_cache__.is_active
+    with begin_scope(Container, item=5, environment="test"):
+        assert Container.process == ("model-test", 10)
+    assert list(results) == [("model-prod", 4)]
+
+
+def test_resolve_batch_item_has_unknown_value__error_is_raised():
+    class Container(ScopedInjector):
+        item = dynamic_value
+        environment = dynamic_value
+
+        @cached_value
+        def model(environment):
+            return f"model-{environment}"
+
+        @value
+        def process(model, item):
+            return model, item * 2
+
+    results = resolve_batch(Container, "process", [{"item": 1, "user": "Alice"}], common={"environment": "prod"})
+    with pytest.raises(DependencyError, match="unknown to the injector: user"):
+        list(results)
+
+
+def test_resolve_batch_item_overrides_common_value__error_is_raised():
+    class Container(ScopedInjector):
+        item = dynamic_value
+        environment = dynamic_value
+
+        @cached_value
+        def model(environment):
+            return f"model-{environment}"
+
+        @value
+        def process(model, item):
+            return model, item * 2
+
+    results = resolve_batch(Container, "process", [{"item": 1, "environment": "dev"}], common={"environment": "prod"})
+    with pytest.raises(DependencyError, match="common dynamic values within an item: environment"):
+        list(results)
+
+
+def test_resolve_batch_of_usual_injector__error_is_raised():
+    class Container(Injector):
+        process = object
+
+    with pytest.raises(DependencyError, match="should be applied to ScopedInjector subclass"):
+        resolve_batch(Container, "process", [])
@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+
+from dite import Injector, ScopedInjector, DependencyError, cached_value, dynamic_value, begin_scope
+from dite.cache_storage import (
+    ContextVarCacheStorage,
+    DictCacheStorage,
+    GlobalCacheStorage,
+    SlotCacheStorage,
+    ThreadLocalCacheStorage,
+)
+from dite.testing import check_cache_storage
+
+
+def test_inherit_injector__storage_is_inherited():
+    class Container(ScopedInjector, storage=ThreadLocalCacheStorage):
+        user = dynamic_value
+
+    class Child(Container):
+        user = dynamic_value
+
+    assert isinstance(Child.__di_cache__, ThreadLocalCacheStorage)
+    assert Child.__di_cache__ is not Container.__di_cache__
+
+
+class InstrumentedCacheStorage(ContextVarCacheStorage):
+    def __init__(self, injector):
+        super().__init__(injector)
+        self.reads = 0
+
+    def __getitem__(self, item):
+        self.reads += 1
+        return super().__getitem__(item)
+
+
+class BrokenCacheStorage(DictCacheStorage):
+    def __contains__(self, item):
+        return True
+
+
+@pytest.mark.parametrize("storage_class", [
+    DictCacheStorage,
+    ContextVarCacheStorage,
+    GlobalCacheStorage,
+    ThreadLocalCacheStorage,
+    SlotCacheStorage,
+    InstrumentedCacheStorage,
+])
+def test_check_storage__conforms_to_protocol(storage_class):
+    check_cache_storage(storage_class)
+
+
+def test_check_broken_storage__raise_error():
+    with pytest.raises(AssertionError, match="BrokenCacheStorage: 'in' should be false for a missing key"):
+        check_cache_storage(BrokenCacheStorage)
+
+
+def test_custom_storage__used_by_injector():
+    class Container(ScopedInjector, storage=InstrumentedCacheStorage):
+        user = dynamic_value
+
+    with begin_scope(Container, user='alice'):
+        _ = Container.user
+
+    assert Container.__di_cache__.reads == 1
+
+
+def test_usual_injector_has_scoped_storage__raise_error():
+    with pytest.raises(DependencyError, match="Usual injectors are disallowed to have ScopedCacheStorage storage"):
+        class Container(Injector, storage=ContextVarCacheStorage):
+            pass
+
+
+def test_scoped_injector_has_usual_storage__raise_error():
+    with pytest.raises(DependencyError, match="Scoped injectors are allowed to have ScopedCacheStorage storage only"):
+        class Container(ScopedInjector, storage=DictCacheStorage):
+            pass
+
+
+def test_injector_has_unknown_storage__raise_error():
+    with pytest.raises(DependencyError, match="Injector storage should be a CacheStorage subclass"):
+        class Container(Injector, storage=dict):
+            pass
+
+
+def test_thread_local_storage__scope_is_not_visible_in_other_threads():
+    class Container(ScopedInjector, storage=ThreadLocalCacheStorage):
+        user = dynamic_value
+
+    results = []
+    with begin_scope(Container, user='alice'):
+        thread = threading.Thread(target=lambda: results.append('user' in Container.__di_cache__))
+        thread.start()
+        thread.join()
+
+    assert results == [False]
+
+
+def test_global_storage__scope_is_visible_in_other_threads():
+    class Container(ScopedInjector, storage=GlobalCacheStorage):
+        user = dynamic_value
+
+    results = []
+    with begin_scope(Container, user='alice'):
+        thread = threading.Thread(target=lambda: results.append(Container.user))
+        thread.start()
+        thread.join()
+
+    assert results == ['alice']
+
+
+def test_slot_storage__dependencies_use_slots():
+    class Container(ScopedInjector, storage=SlotCacheStorage):
+        user = dynamic_value
+
+        @cached_value
+        def greeting(user):
+            return f"hello, {user}"
+
+    cache = Container.__di_cache__
+    with begin_scope(Container, user='alice') as scope:
+        assert Container.greeting == "hello, alice"
+        slot = cache.attr_keys['greeting']
+        assert cache[slot] is cache['greeting']
+        assert cache.snapshot(scope.storage).keys() == {'user', 'greeting'}
+        assert scope.storage[slot] is cache[slot]
+
+
+def test_slot_storage__forked_scope_rebuilds_overridden_values():
+    class Container(ScopedInjector, storage=SlotCacheStorage):
+        user = dynamic_value
+
+        @cached_value(fork_safe=False)
+        def greeting(user):
+            return f"hello, {user}"
+
+    with begin_scope(Container, user='alice') as scope:
+        _ = Container.greeting
+        with scope.fork(user='ben'):
+            assert Container.greeting == "hello, ben"
+        assert Container.greeting == "hello, alice"
+        assert Container.__di_cache__.fork_unsafe_keys(scope.storage) == {'greeting'}
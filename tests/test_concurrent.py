@@ -0,0 +1,159 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from dite import Injector, ScopedInjector, cached_value, dynamic_value, begin_scope, lazy
+from dite.concurrent import (
+    ScopedThreadPoolExecutor, ScopedProcessPoolExecutor, submit_in_scope, snapshot_scopes, restore_scopes,
+)
+
+
+class Session:
+    def __init__(self, user):
+        self.user = user
+
+
+def _make_container():
+    class Container(ScopedInjector):
+        user = dynamic_value
+        session = cached_value(Session)
+
+    return Container
+
+
+def test_submit_to_scoped_executor__active_scope_is_propagated():
+    Container = _make_container()
+
+    with ScopedThreadPoolExecutor(max_workers=2) as executor:
+        with begin_scope(Container, user='alice'):
+            session = Container.session
+            futures = [executor.submit(lambda: Container.session) for _ in range(4)]
+        with begin_scope(Container, user='ben'):
+            ben_user = executor.submit(lambda: Container.user).result()
+
+    assert all(future.result() is session for future in futures)
+    assert ben_user == 'ben'
+
+
+def test_map_with_scoped_executor__active_scope_is_propagated():
+    Container = _make_container()
+
+    with ScopedThreadPoolExecutor(max_workers=2) as executor:
+        with begin_scope(Container, user='alice'):
+            results = list(executor.map(lambda suffix: Container.user + suffix, ['1', '2']))
+
+    assert results == ['alice1', 'alice2']
+
+
+def test_submit_in_scope__active_scope_is_propagated():
+    Container = _make_container()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with begin_scope(Container, user='alice'):
+            future = submit_in_scope(executor, lambda suffix: Container.user + suffix, suffix='!')
+
+    assert future.result() == 'alice!'
+
+
+def test_scope_stops_in_worker__submitting_scope_is_not_affected():
+    Container = _make_container()
+
+    def nested():
+        with begin_scope(Container, user='ben'):
+            return Container.user
+
+    with ScopedThreadPoolExecutor(max_workers=1) as executor:
+        with begin_scope(Container, user='alice'):
+            result = executor.submit(nested).result()
+            assert Container.user == 'alice'
+
+    assert result == 'ben'
+
+
+BUILT_MODELS = []
+
+
+class ProcessContainer(ScopedInjector):
+    tenant = dynamic_value
+
+    class Models(Injector):
+        @cached_value
+        def model():
+            BUILT_MODELS.append(1)
+            return "model"
+
+    class Request(ScopedInjector):
+        user = dynamic_value
+
+    @cached_value
+    def report(tenant):
+        return f"report for {tenant}"
+
+
+def _generate_report(suffix):
+    return f"{ProcessContainer.report} by {ProcessContainer.Request.user}{suffix}"
+
+
+def _load_user():
+    return 'alice'
+
+
+def _count_built_models():
+    return len(BUILT_MODELS)
+
+
+def test_submit_to_process_executor__active_scopes_are_reentered():
+    with ScopedProcessPoolExecutor(ProcessContainer, max_workers=1) as executor:
+        with begin_scope(ProcessContainer, tenant='acme'), begin_scope(ProcessContainer.Request, user=lazy(_load_user)):
+            result = executor.submit(_generate_report, '!').result()
+
+    assert result == "report for acme by alice!"
+
+
+def test_process_executor_with_warm_up__cached_values_are_built_on_worker_start():
+    with ScopedProcessPoolExecutor(ProcessContainer, max_workers=1, warm_up=True) as executor:
+        result = executor.submit(_count_built_models).result()
+
+    assert result == 1
+    assert BUILT_MODELS == []
+
+
+def test_map_with_process_executor__active_scopes_are_reentered():
+    with ScopedProcessPoolExecutor(ProcessContainer, max_workers=2) as executor:
+        with begin_scope(ProcessContainer, tenant='acme'), begin_scope(ProcessContainer.Request, user='alice'):
+            results = list(executor.map(_generate_report, ['1', '2']))
+
+    assert results == ["report for acme by alice1", "report for acme by alice2"]
+
+
+def test_snapshot_scopes__only_active_scopes_are_captured():
+    with begin_scope(ProcessContainer, tenant='acme'):
+        snapshot = snapshot_scopes(ProcessContainer)
+
+    assert snapshot == {(): {'tenant': 'acme'}}
+
+
+def test_snapshot_scopes_with_lazy_values__only_evaluated_values_are_shipped():
+    calls = []
+
+    def load_user():
+        calls.append(1)
+        return 'alice'
+
+    with begin_scope(ProcessContainer, tenant=lazy(lambda: 'acme')):
+        with begin_scope(ProcessContainer.Request, user=lazy(load_user)):
+            _ = ProcessContainer.tenant
+            snapshot = snapshot_scopes(ProcessContainer)
+
+    assert calls == []
+    assert snapshot[()] == {'tenant': 'acme'}
+    with restore_scopes(ProcessContainer, snapshot):
+        assert ProcessContainer.Request.user == 'alice'
+    assert calls == [1]
+
+
+def test_restore_scopes__scopes_are_active():
+    with begin_scope(ProcessContainer, tenant='acme'), begin_scope(ProcessContainer.Request, user='alice'):
+        snapshot = snapshot_scopes(ProcessContainer)
+
+    with restore_scopes(ProcessContainer, snapshot):
+        assert (ProcessContainer.tenant, ProcessContainer.Request.user) == ('acme', 'alice')
+    assert snapshot == {(): {'tenant': 'acme'}, ('Request',): {'user': 'alice'}}
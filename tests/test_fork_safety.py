@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from dite import Injector, ScopedInjector, cached_value, thread_local_cached_value, begin_scope, dynamic_value
+from dite.cache_storage import _discard_fork_unsafe_values
+
+
+class Pool:
+    pass
+
+
+class Settings:
+    pass
+
+
+def test_fork_happens__fork_unsafe_value_is_rebuilt():
+    class Container(Injector):
+        pool = cached_value(Pool, fork_safe=False)
+
+    a = Container.pool
+    _discard_fork_unsafe_values()
+    b = Container.pool
+    c = Container.pool
+
+    assert a is not b
+    assert b is c
+
+
+def test_fork_happens__fork_safe_value_is_kept():
+    class Container(Injector):
+        pool = cached_value(Pool)
+
+        @cached_value(fork_safe=True)
+        def settings():
+            return {}
+
+    a, settings = Container.pool, Container.settings
+    _discard_fork_unsafe_values()
+
+    assert Container.pool is a
+    assert Container.settings is settings
+
+
+def test_fork_happens_in_active_scope__fork_unsafe_value_is_rebuilt():
+    class Container(ScopedInjector):
+        pool = cached_value(Pool, fork_safe=False)
+        settings = cached_value(Settings)
+
+    with begin_scope(Container):
+        a, settings = Container.pool, Container.settings
+        _discard_fork_unsafe_values()
+        b = Container.pool
+
+        assert Container.settings is settings
+    assert a is not b
+
+
+def test_fork_happens_in_forked_scope__inherited_fork_unsafe_value_is_rebuilt():
+    class Container(ScopedInjector):
+        item = dynamic_value
+        pool = cached_value(Pool, fork_safe=False)
+        settings = cached_value(Settings)
+
+    with begin_scope(Container, item=1) as scope:
+        pool, settings = Container.pool, Container.settings
+        with scope.fork(item=2):
+            assert Container.pool is pool
+            _discard_fork_unsafe_values()
+            forked_pool = Container.pool
+            assert Container.settings is settings
+
+    assert forked_pool is not pool
+
+
+def test_fork_happens__fork_unsafe_thread_local_value_is_rebuilt():
+    class Container(Injector):
+        pool = thread_local_cached_value(Pool, fork_safe=False)
+
+    a = Container.pool
+    _discard_fork_unsafe_values()
+
+    assert Container.pool is not a
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="os.fork() is not available")
+def test_fork_process__child_rebuilds_only_fork_unsafe_values():
+    class Container(Injector):
+        pool = cached_value(Pool, fork_safe=False)
+        settings = cached_value(Settings)
+
+    pool, settings = Container.pool, Container.settings
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.close(read_fd)
+        result = b"%d%d" % (Container.pool is pool, Container.settings is settings)
+        os.write(write_fd, result)
+        os._exit(0)
+    os.close(write_fd)
+    result = os.read(read_fd, 2)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+
+    assert result == b"01"
+    assert Container.pool is pool
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import math
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, cached_value, dynamic_value, begin_scope, lazy, lazy_dependency, value, session,
+)
+from dite.exceptions import UnknownAttributeError, UnexpectedDefaultValueError
+
+
+class Mailer:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message)
+        return len(self.sent)
+
+
+class Handler:
+    def __init__(self, mailer=lazy_dependency):
+        self.mailer = mailer
+
+
+def test_lazy_parameter__dependency_is_built_on_first_usage():
+    calls = []
+
+    class Container(Injector):
+        handler = Handler
+
+        @value
+        def mailer():
+            calls.append(1)
+            return Mailer()
+
+    handler = Container.handler
+    assert calls == []
+    assert handler.mailer.send("hello") == 1
+    assert handler.mailer.sent == ["hello"]
+    assert calls == [1]
+
+
+def test_lazy_proxy__is_transparent():
+    class Container(Injector):
+        handler = Handler
+        mailer = Mailer
+
+    mailer = Container.handler.mailer
+    assert isinstance(mailer, Mailer)
+    mailer.name = "smtp"
+    assert mailer.name == "smtp"
+
+
+class Limits:
+    def __init__(self, limit=lazy_dependency):
+        self.limit = limit
+
+
+def test_lazy_proxy_of_number__operators_are_forwarded():
+    class Container(Injector):
+        limits = Limits
+        limit = value(lambda: 7)
+
+    limit = Container.limits.limit
+    assert limit + 1 == 8 and 1 + limit == 8
+    assert limit - 2 == 5 and 10 - limit == 3
+    assert limit * 2 == 14 and limit / 2 == 3.5 and limit // 2 == 3 and limit % 4 == 3
+    assert limit ** 2 == 49 and 2 ** limit == 128 and pow(limit, 2, 5) == 4
+    assert divmod(limit, 2) == (3, 1) and divmod(15, limit) == (2, 1)
+    assert limit & 3 == 3 and limit | 8 == 15 and limit ^ 1 == 6 and limit << 1 == 14 and limit >> 1 == 3
+    assert limit < 10 and limit <= 7 and limit > 1 and limit >= 7 and not limit < 5
+    assert -limit == -7 and +limit == 7 and abs(limit) == 7 and ~limit == -8
+    assert int(limit) == 7 and float(limit) == 7.0 and complex(limit) == 7
+    assert [0, 1, 2, 3, 4, 5, 6, 7][limit] == 7 and round(limit) == 7
+    assert math.floor(limit) == 7 and math.ceil(limit) == 7 and math.trunc(limit) == 7
+    assert f"{limit:03d}" == "007"
+    limit += 1
+    assert limit == 8
+
+
+def test_lazy_proxy_of_list__in_place_operators_are_forwarded():
+    class Container(Injector):
+        limits = Limits
+        limit = value(lambda: [1])
+
+    proxy = limit = Container.limits.limit
+    limit += [2]
+    assert proxy == [1, 2]
+    assert list(reversed(proxy)) == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_lazy_proxy_of_awaitable__can_be_awaited():
+    class Container(Injector):
+        limits = Limits
+
+        @value
+        def limit():
+            return asyncio.sleep(0, result=7)
+
+    assert await Container.limits.limit == 7
+
+
+def test_lazy_proxy_is_used__context_is_released():
+    class Container(Injector):
+        handler = Handler
+        mailer = Mailer
+
+    mailer = Container.handler.mailer
+    assert object.__getattribute__(mailer, '__di_context__') is not None
+    mailer.send("hello")
+    assert object.__getattribute__(mailer, '__di_context__') is None
+
+
+def test_lazy_dynamic_value_class_as_default__error_is_raised():
+    class Service:
+        def __init__(self, mailer=lazy):
+            self.mailer = mailer
+
+    with pytest.raises(UnexpectedDefaultValueError):
+        class Container(Injector):
+            service = Service
+
+
+def test_lazy_proxy__builds_within_scope_of_injection():
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+        @value
+        def greeting(user):
+            return f"Hello, {user}"
+
+        @value
+        def handler(greeting=lazy_dependency):
+            return greeting
+
+    with begin_scope(Container, user="Alice"):
+        greeting = Container.handler
+    assert str(greeting) == "Hello, Alice"
+    assert greeting == "Hello, Alice"
+
+
+def test_lazy_parameter_of_cached_value__no_stale_warning(caplog):
+    class Container(Injector):
+        handler = cached_value(Handler)
+        mailer = Mailer
+
+    with caplog.at_level(logging.WARNING):
+        assert Container.handler is Container.handler
+    assert caplog.records == []
+
+
+def test_lazy_dependency_is_already_built__value_is_passed():
+    class Container(Injector):
+        handler = Handler
+        mailer = Mailer
+
+    with session(Container):
+        mailer = Container.mailer
+        assert Container.handler.mailer is mailer
+
+
+def test_lazy_parameters__break_cycles():
+    class Container(Injector):
+        @cached_value
+        def parent(child=lazy_dependency):
+            return {"child": child}
+
+        @cached_value
+        def child(parent):
+            return {"parent": parent}
+
+    parent = Container.parent
+    assert parent["child"]["parent"] is parent
+
+
+def test_lazy_dependency_does_not_exist__error_is_raised():
+    with pytest.raises(UnknownAttributeError, match="Container.mailer' doesn't exist.*referred from '.*Container.handler'"):
+        class Container(Injector):
+            handler = Handler
+
+
+def test_lazy_dependency_fails__error_is_raised_on_usage():
+    class Container(Injector):
+        handler = Handler
+
+        @value
+        def mailer():
+            raise ConnectionError("refused")
+
+    handler = Container.handler
+    with pytest.raises(ConnectionError):
+        handler.mailer.send("hello")
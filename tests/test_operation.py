@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from dite import Injector, operation, DependencyError
+from dite import Injector, operation, value, map_operation, DependencyError
 
 
 def shorten_names(input):
@@ -118,3 +120,63 @@ def test_apply_operation_to_foreign_method__raise_error():
     with pytest.raises(DependencyError, match="'operation' decorator can not be used on methods"):
         class Container(Injector):
             method = operation(Foo.method)
+
+
+def test_operation_map__dependencies_are_bound_once():
+    calls = []
+
+    class Container(Injector):
+        @value
+        def factor():
+            calls.append(1)
+            return 10
+
+        @operation
+        def scale(record=None, factor=1):
+            return record * factor
+
+    assert list(Container.scale.map([1, 2, 3])) == [10, 20, 30]
+    assert len(calls) == 1
+
+
+def test_operation_map_with_argument__item_is_passed_by_name():
+    class Container(Injector):
+        factor = 10
+
+        @operation
+        def scale(factor, record=None):
+            return record * factor
+
+    assert list(Container.scale.map([1, 2], argument="record")) == [10, 20]
+
+
+def test_operation_map_with_executor__results_are_in_order():
+    class Container(Injector):
+        factor = 10
+
+        @operation
+        def scale(record=None, factor=1):
+            return record * factor
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(Container.scale.map(range(50), chunksize=7, executor=executor, max_in_flight=2))
+    assert results == [i * 10 for i in range(50)]
+
+
+def test_map_operation__operation_is_resolved_and_mapped():
+    class Container(Injector):
+        factor = 10
+
+        @operation
+        def scale(record=None, factor=1):
+            return record * factor
+
+    assert list(map_operation(Container, "scale", [1, 2])) == [10, 20]
+
+
+def test_map_operation_of_value__error_is_raised():
+    class Container(Injector):
+        factor = 10
+
+    with pytest.raises(DependencyError, match="is not an operation"):
+        map_operation(Container, "factor", [1])
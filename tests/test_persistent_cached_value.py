@@ -0,0 +1,175 @@
+import array
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from dite import Injector, DependencyError, persistent_cached_value
+
+
+class Vocabulary:
+    def __init__(self, words):
+        self.words = words
+
+
+class Matrix:
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        return type(self), (pickle.PickleBuffer(self.data),)
+
+
+CHILD_SCRIPT = """
+import sys
+from dite import Injector, persistent_cached_value
+
+class Container(Injector):
+    stop_words = frozenset(["a", "an", "the", "of", "to", "in"])
+    weights = {"title": {2, 3, 5}, "body": {1}}
+
+    @persistent_cached_value(path=sys.argv[1])
+    def vocabulary(stop_words, weights):
+        print("built")
+        return sorted(stop_words)
+
+_ = Container.vocabulary
+"""
+
+
+def test_request_value_multiple_times__return_the_same_value(tmp_path):
+    calls = []
+
+    class Container(Injector):
+        size = 3
+
+        @persistent_cached_value(path=str(tmp_path))
+        def vocabulary(size):
+            calls.append(size)
+            return Vocabulary(["word"] * size)
+
+    a = Container.vocabulary
+    b = Container.vocabulary
+
+    assert a is b
+    assert a.words == ["word"] * 3
+    assert calls == [3]
+
+
+def test_value_is_stored__another_injector_loads_it_without_building(tmp_path):
+    calls = []
+    vocabularies = []
+    for _ in range(2):
+        class Container(Injector):
+            size = 3
+
+            @persistent_cached_value(path=str(tmp_path))
+            def vocabulary(size):
+                calls.append(size)
+                return Vocabulary(["word"] * size)
+
+        vocabularies.append(Container.vocabulary)
+    first, second = vocabularies
+
+    assert calls == [3]
+    assert first is not second
+    assert second.words == ["word"] * 3
+
+
+def test_dependencies_differ__value_is_built_again(tmp_path):
+    calls = []
+    for words in [3, 5]:
+        class Container(Injector):
+            size = words
+
+            @persistent_cached_value(path=str(tmp_path))
+            def vocabulary(size):
+                calls.append(size)
+                return Vocabulary(["word"] * size)
+
+        vocabulary = Container.vocabulary
+
+    assert calls == [3, 5]
+    assert len(vocabulary.words) == 5
+
+
+def test_set_dependencies_in_processes_with_different_hash_seeds__value_is_loaded(tmp_path):
+    outputs = []
+    for seed in ["1", "2"]:
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), PYTHONHASHSEED=seed)
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD_SCRIPT, str(tmp_path)], env=environment, capture_output=True, check=True
+        )
+        outputs.append(result.stdout.strip())
+
+    assert outputs == [b"built", b""]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_buffer_values__loaded_as_memory_mapped_views(tmp_path):
+    class Container(Injector):
+        @persistent_cached_value(path=str(tmp_path))
+        def table():
+            return array.array("i", range(3))
+
+        @persistent_cached_value(path=str(tmp_path))
+        def blob():
+            return b"\x00\x01\x02"
+
+    table = Container.table
+    blob = Container.blob
+
+    assert isinstance(table, memoryview)
+    assert table.readonly
+    assert table.tolist() == [0, 1, 2]
+    assert bytes(blob) == b"\x00\x01\x02"
+
+
+def test_value_has_out_of_band_buffers__buffers_are_memory_mapped(tmp_path):
+    class Container(Injector):
+        @persistent_cached_value(path=str(tmp_path))
+        def matrix():
+            return Matrix(bytearray(b"\x01" * 1024))
+
+    matrix = Container.matrix
+
+    assert isinstance(matrix.data, memoryview)
+    assert matrix.data.readonly
+    assert bytes(matrix.data) == b"\x01" * 1024
+
+
+def test_explicit_key__used_instead_of_fingerprint(tmp_path):
+    class Container(Injector):
+        lock = object()
+
+        @persistent_cached_value(path=str(tmp_path), key="vocabulary-v1")
+        def vocabulary(lock):
+            return Vocabulary(["word"])
+
+    assert Container.vocabulary.words == ["word"]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_dependencies_can_not_be_fingerprinted__raise_error(tmp_path):
+    class Container(Injector):
+        lock = pytest
+
+        @persistent_cached_value(path=str(tmp_path))
+        def vocabulary(lock):
+            return Vocabulary(["word"])
+
+    with pytest.raises(DependencyError, match=r"Cannot fingerprint the dependencies of '.*Container.vocabulary'"):
+        _ = Container.vocabulary
+
+
+def test_value_can_not_be_pickled__raise_error(tmp_path):
+    class Container(Injector):
+        @persistent_cached_value(path=str(tmp_path))
+        def vocabulary():
+            return lambda: None
+
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        _ = Container.vocabulary
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,222 @@
+import threading
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, DependencyError, pooled_value, pool_stats, begin_scope, shutdown, cached_value,
+    dynamic_value, this,
+)
+from dite.exceptions import PoolTimeoutError
+
+
+class Client:
+    def __init__(self):
+        self.healthy = True
+        self.dirty = False
+
+
+def test_pooled_value__is_checked_out_once_per_scope():
+    class Container(ScopedInjector):
+        client = pooled_value(Client)
+
+    with begin_scope(Container):
+        a = Container.client
+        b = Container.client
+    assert a is b
+
+
+def test_scope_stops__instance_is_returned_to_pool():
+    class Container(ScopedInjector):
+        client = pooled_value(Client, maxsize=2)
+
+    with begin_scope(Container):
+        first = Container.client
+        assert pool_stats(Container, "client").in_use == 1
+    with begin_scope(Container):
+        second = Container.client
+
+    assert first is second
+    stats = pool_stats(Container, "client")
+    assert (stats.size, stats.idle, stats.in_use, stats.checkouts, stats.created) == (1, 1, 0, 2, 1)
+
+
+def test_concurrent_scopes__get_different_instances():
+    class Container(ScopedInjector):
+        client = pooled_value(Client, maxsize=2)
+
+    with begin_scope(Container):
+        first = Container.client
+        with begin_scope(Container):
+            second = Container.client
+    assert first is not second
+
+
+def test_pool_is_exhausted__waits_for_released_instance():
+    class Container(ScopedInjector):
+        client = pooled_value(Client, maxsize=1, timeout=5)
+
+    checked_out = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with begin_scope(Container):
+            Container.client
+            checked_out.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    checked_out.wait(5)
+    threading.Timer(0.05, release.set).start()
+    with begin_scope(Container):
+        Container.client
+    thread.join()
+    assert pool_stats(Container, "client").created == 1
+
+
+def test_pool_is_exhausted__timeout_error_is_raised():
+    class Container(ScopedInjector):
+        client = pooled_value(Client, maxsize=1, timeout=0.01)
+
+    with begin_scope(Container):
+        Container.client
+        with begin_scope(Container):
+            with pytest.raises(PoolTimeoutError, match="Container.client' became available within 0.01 seconds"):
+                Container.client
+    assert pool_stats(Container, "client").timeouts == 1
+
+
+def test_health_check_fails__instance_is_replaced():
+    class Container(ScopedInjector):
+        client = pooled_value(Client, check=lambda client: client.healthy)
+
+    with begin_scope(Container):
+        first = Container.client
+        first.healthy = False
+    with begin_scope(Container):
+        second = Container.client
+
+    assert first is not second
+    assert pool_stats(Container, "client").discarded == 1
+
+
+def test_reset_hook__is_called_on_release():
+    def reset(client):
+        client.dirty = False
+
+    class Container(ScopedInjector):
+        client = pooled_value(Client, reset=reset)
+
+    with begin_scope(Container):
+        client = Container.client
+        client.dirty = True
+    assert not client.dirty
+
+
+def test_min_idle__instances_are_created_with_pool():
+    class Container(ScopedInjector):
+        client = pooled_value(Client, maxsize=4, min_idle=2)
+
+    with begin_scope(Container):
+        Container.client
+    stats = pool_stats(Container, "client")
+    assert (stats.size, stats.created) == (2, 2)
+
+
+def test_factory_dependencies__are_resolved():
+    class Container(ScopedInjector):
+        url = "sqlite://"
+
+        @pooled_value(maxsize=2)
+        def connection(url):
+            return {"url": url}
+
+    with begin_scope(Container):
+        assert Container.connection == {"url": "sqlite://"}
+
+
+def test_factory_depends_on_dynamic_value__error_is_raised():
+    with pytest.raises(DependencyError, match=r"'.*Container.db' is shared by all the scopes, .* '.*Container.tenant'"):
+        class Container(ScopedInjector):
+            tenant = dynamic_value
+
+            @pooled_value
+            def db(tenant):
+                return {"db": tenant}
+
+
+def test_factory_depends_on_scope_cached_value__error_is_raised():
+    with pytest.raises(DependencyError, match=r"can't depend on the scope value '.*Container.settings'"):
+        class Container(ScopedInjector):
+            tenant = dynamic_value
+            settings = cached_value(Client)
+
+            @pooled_value
+            def db(url):
+                return {"url": url}
+
+            url = this.settings
+
+
+def test_nested_injector_factory_depends_on_parent_dynamic_value__error_is_raised():
+    class Request(ScopedInjector):
+        @pooled_value
+        def db(tenant):
+            return {"db": tenant}
+
+        tenant = (this << 1).tenant
+
+    with pytest.raises(DependencyError, match=r"can't depend on the scope value '.*Tenant.tenant'"):
+        class Tenant(ScopedInjector):
+            tenant = dynamic_value
+            request = Request
+
+
+def test_factory_depends_on_usual_injector_value__ok():
+    class Request(ScopedInjector):
+        @pooled_value
+        def db(url):
+            return {"url": url}
+
+        url = (this << 1).url
+
+    class Application(Injector):
+        url = "sqlite://"
+        request = Request
+
+    with begin_scope(Application.request):
+        assert Application.request.db == {"url": "sqlite://"}
+
+
+def test_usual_injector__instance_is_returned_on_shutdown():
+    class Container(Injector):
+        client = pooled_value(Client)
+
+    client = Container.client
+    assert Container.client is client
+    shutdown(Container)
+    assert pool_stats(Container, "client").idle == 1
+
+
+def test_no_active_scope__error_is_raised():
+    class Container(ScopedInjector):
+        client = pooled_value(Client)
+
+    with pytest.raises(DependencyError, match="no active scope"):
+        Container.client
+    assert pool_stats(Container, "client").idle == 1
+
+
+def test_invalid_pool_size__error_is_raised():
+    with pytest.raises(DependencyError, match="maxsize"):
+        pooled_value(Client, maxsize=0)
+    with pytest.raises(DependencyError, match="min_idle"):
+        pooled_value(Client, maxsize=1, min_idle=2)
+
+
+def test_pool_stats_of_regular_value__error_is_raised():
+    class Container(Injector):
+        client = Client
+
+    with pytest.raises(DependencyError, match="is not a pooled value"):
+        pool_stats(Container, "client")
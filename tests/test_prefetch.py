@@ -0,0 +1,291 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dite import prefetch
+from dite import (
+    Injector, ScopedInjector, cached_value, dynamic_value, thread_local_cached_value, begin_scope, begin_scopes,
+    async_cached_value, aresolve,
+)
+from dite.exceptions import DependencyError
+
+
+def test_scope_starts__prefetched_values_are_built_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Container(ScopedInjector):
+        @cached_value(prefetch=True)
+        def first():
+            barrier.wait()
+            return object()
+
+        @cached_value(prefetch=True)
+        def second():
+            barrier.wait()
+            return object()
+
+    with begin_scope(Container):
+        first, second = Container.first, Container.second
+        assert Container.first is first
+        assert Container.second is second
+
+
+def test_prefetched_value_is_accessed__value_is_built_once():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    class Container(ScopedInjector):
+        @cached_value(prefetch=True)
+        def value():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+    with begin_scope(Container):
+        started.wait(5)
+        release.set()
+        a = Container.value
+        b = Container.value
+
+    assert a is b
+    assert len(calls) == 1
+
+
+def test_prefetched_value_depends_on_queued_prefetched_value__value_is_built_by_waiting_worker(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(prefetch, '_executor', executor)
+    release = threading.Event()
+
+    class Container(ScopedInjector):
+        @cached_value(prefetch=True)
+        def report(data):
+            return f"report of {data}"
+
+        @cached_value(prefetch=True)
+        def data():
+            return 'data'
+
+    def resolve(results):
+        # the only worker is busy until both values are queued
+        executor.submit(release.wait, 5)
+        with begin_scope(Container):
+            release.set()
+            results.append(Container.report)
+
+    results = []
+    thread = threading.Thread(target=resolve, args=(results,), daemon=True)
+    thread.start()
+    thread.join(5)
+    executor.shutdown(wait=False)
+
+    assert results == ["report of data"]
+
+
+def test_scope_stops_while_prefetching_resource__resource_is_released():
+    started = threading.Event()
+    released = []
+
+    class Container(ScopedInjector):
+        @cached_value(prefetch=True)
+        def connection():
+            started.set()
+            time.sleep(0.1)
+            yield "connection"
+            released.append("connection")
+
+    with begin_scope(Container):
+        started.wait(5)
+
+    assert released == ["connection"]
+
+
+@pytest.mark.asyncio
+async def test_scope_stops_asynchronously_while_prefetching_resource__resource_is_released():
+    started = threading.Event()
+    released = []
+
+    class Container(ScopedInjector):
+        @cached_value(prefetch=True)
+        def connection():
+            started.set()
+            time.sleep(0.1)
+            yield "connection"
+            released.append("connection")
+
+    async with begin_scope(Container):
+        started.wait(5)
+
+    assert released == ["connection"]
+
+
+def test_prefetched_value_depends_on_dynamic_value__value_uses_scope_values():
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+        @cached_value(prefetch=True)
+        def greeting(user):
+            return f"Hello, {user}"
+
+    with begin_scope(Container, user="Alice"):
+        assert Container.greeting == "Hello, Alice"
+    with begin_scope(Container, user="Bob"):
+        assert Container.greeting == "Hello, Bob"
+
+
+def test_prefetching_fails__error_is_raised_on_access():
+    calls = []
+    started = threading.Event()
+
+    class Container(ScopedInjector):
+        @cached_value(prefetch=True)
+        def value():
+            calls.append(1)
+            started.set()
+            raise ValueError("boom")
+
+    with begin_scope(Container):
+        started.wait(5)
+        with pytest.raises(ValueError, match="boom"):
+            Container.value
+
+    assert len(calls) == 2
+
+
+def test_begin_scopes__prefetched_values_are_built():
+    class Container(ScopedInjector):
+        value = cached_value(object, prefetch=True)
+
+    with begin_scopes({Container: {}}):
+        a = Container.value
+        assert Container.value is a
+
+
+def test_fork_is_taken_while_prefetching__forked_scope_builds_value_itself():
+    release = threading.Event()
+
+    class Container(ScopedInjector):
+        item = dynamic_value
+
+        @cached_value(prefetch=True)
+        def value():
+            release.wait(5)
+            return object()
+
+    with begin_scope(Container, item=None) as scope:
+        with scope.fork(item=1):
+            release.set()
+            forked = Container.value
+        assert Container.value is not forked
+
+
+def test_usual_injector_has_prefetched_value__error_is_raised():
+    with pytest.raises(DependencyError, match="prefetched cached values"):
+        class Container(Injector):
+            value = cached_value(object, prefetch=True)
+
+
+def test_thread_local_cached_value_is_prefetched__error_is_raised():
+    with pytest.raises(DependencyError, match="can not be prefetched"):
+        thread_local_cached_value(object, prefetch=True)
+
+
+@pytest.mark.asyncio
+async def test_scope_is_entered_asynchronously__prefetched_value_is_available():
+    class Container(ScopedInjector):
+        value = cached_value(object, prefetch=True)
+
+    async with begin_scope(Container):
+        a = Container.value
+        assert Container.value is a
+
+
+@pytest.mark.asyncio
+async def test_scope_is_entered_asynchronously__async_prefetched_value_is_built_by_task():
+    started = asyncio.Event()
+    calls = []
+
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+        @async_cached_value(prefetch=True)
+        async def profile(user):
+            calls.append(user)
+            started.set()
+            return {"user": user}
+
+    async with begin_scope(Container, user="alice"):
+        await asyncio.wait_for(started.wait(), 5)
+        a = await aresolve(Container, "profile")
+        b = await aresolve(Container, "profile")
+
+    assert a is b
+    assert a == {"user": "alice"}
+    assert calls == ["alice"]
+
+
+@pytest.mark.asyncio
+async def test_scope_stack_is_entered_asynchronously__async_prefetched_value_is_built_by_task():
+    started = asyncio.Event()
+
+    class Container(ScopedInjector):
+        @async_cached_value(prefetch=True)
+        async def profile():
+            started.set()
+            return object()
+
+    async with begin_scopes({Container: {}}):
+        await asyncio.wait_for(started.wait(), 5)
+
+
+@pytest.mark.asyncio
+async def test_scope_stops_while_async_prefetching__build_is_cancelled():
+    started = asyncio.Event()
+    cancelled = []
+
+    class Container(ScopedInjector):
+        @async_cached_value(prefetch=True)
+        async def profile():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+    async with begin_scope(Container):
+        await asyncio.wait_for(started.wait(), 5)
+
+    assert cancelled == [True]
+
+
+@pytest.mark.asyncio
+async def test_async_prefetching_fails__error_is_raised_on_access():
+    calls = []
+    started = asyncio.Event()
+
+    class Container(ScopedInjector):
+        @async_cached_value(prefetch=True)
+        async def profile():
+            calls.append(1)
+            started.set()
+            raise ValueError("boom")
+
+    async with begin_scope(Container):
+        await asyncio.wait_for(started.wait(), 5)
+        with pytest.raises(ValueError, match="boom"):
+            await aresolve(Container, "profile")
+
+    assert len(calls) == 2
+
+
+def test_usual_injector_has_async_prefetched_value__error_is_raised():
+    with pytest.raises(DependencyError, match="disallowed to have prefetched cached values"):
+        class Container(Injector):
+            @async_cached_value(prefetch=True)
+            async def profile():
+                return object()
@@ -0,0 +1,178 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, resolve, value, cached_value, thread_local_cached_value, dynamic_value, begin_scope, this,
+)
+from dite.exceptions import DynamicValueNotSetError
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def test_resolve_without_executor__value_is_built():
+    class Container(Injector):
+        name = "Alice"
+
+        @value
+        def greeting(name):
+            return f"Hello, {name}"
+
+    assert resolve(Container, "greeting") == "Hello, Alice"
+
+
+def test_independent_branches__are_built_concurrently(executor):
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Container(Injector):
+        @value
+        def cache():
+            barrier.wait()
+            return "cache"
+
+        @value
+        def database():
+            barrier.wait()
+            return "database"
+
+        @value
+        def app(cache, database):
+            return cache, database
+
+    assert resolve(Container, "app", executor=executor) == ("cache", "database")
+
+
+def test_dependency_order__is_kept(executor):
+    order = []
+
+    class Container(Injector):
+        @value
+        def config():
+            order.append("config")
+            return {"url": "sqlite://"}
+
+        @value
+        def database(config):
+            order.append("database")
+            return config["url"]
+
+        @value
+        def cache(config):
+            order.append("cache")
+            return "cache"
+
+        @value
+        def app(database, cache, config):
+            order.append("app")
+            return database, cache
+
+    assert resolve(Container, "app", executor=executor) == ("sqlite://", "cache")
+    assert order[0] == "config"
+    assert order[-1] == "app"
+    assert order.count("config") == 1
+
+
+def test_max_in_flight__bounds_submitted_work(executor):
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def slow(name):
+        with lock:
+            running.append(name)
+            peak.append(len(running))
+        threading.Event().wait(0.01)
+        with lock:
+            running.remove(name)
+        return name
+
+    class Container(Injector):
+        a = value(lambda: slow("a"))
+        b = value(lambda: slow("b"))
+        c = value(lambda: slow("c"))
+
+        @value
+        def app(a, b, c):
+            return a, b, c
+
+    assert resolve(Container, "app", executor=executor, max_in_flight=1) == ("a", "b", "c")
+    assert max(peak) == 1
+
+
+def test_nested_injector__parent_values_are_resolved(executor):
+    class Container(Injector):
+        name = "Alice"
+
+        class Nested(Injector):
+            name = (this << 1).name
+
+            @value
+            def greeting(name):
+                return f"Hello, {name}"
+
+    assert resolve(Container.Nested, "greeting", executor=executor) == "Hello, Alice"
+
+
+def test_cached_value_within_scope__is_cached_in_scope(executor):
+    class Container(ScopedInjector):
+        client = cached_value(object)
+
+        @value
+        def app(client):
+            return client
+
+    with begin_scope(Container):
+        a = resolve(Container, "app", executor=executor)
+        assert Container.client is a
+
+
+def test_thread_local_cached_value__is_built_in_caller_thread(executor):
+    class Container(Injector):
+        @thread_local_cached_value
+        def connection():
+            return threading.get_ident()
+
+        @value
+        def app(connection):
+            return connection
+
+    assert resolve(Container, "app", executor=executor) == threading.get_ident()
+
+
+def test_dynamic_value_is_not_set__error_keeps_attribution(executor):
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+        @value
+        def app(user):
+            return user
+
+    with pytest.raises(DynamicValueNotSetError, match="Container.user' is accessed.*required to build '.*Container.app'"):
+        resolve(Container, "app", executor=executor)
+
+
+def test_factory_raises__error_is_propagated(executor):
+    class Container(Injector):
+        @value
+        def database():
+            raise ConnectionError("refused")
+
+        @value
+        def app(database):
+            return database
+
+    with pytest.raises(ConnectionError, match="refused"):
+        resolve(Container, "app", executor=executor)
+
+
+def test_max_in_flight_is_not_positive__error_is_raised(executor):
+    class Container(Injector):
+        app = object
+
+    with pytest.raises(ValueError):
+        resolve(Container, "app", executor=executor, max_in_flight=0)
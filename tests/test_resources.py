@@ -0,0 +1,253 @@
+import os
+from unittest import mock
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, DependencyError, value, cached_value, async_value, async_cached_value, weak_cached_value,
+    begin_scope, begin_scopes, aresolve, shutdown, ashutdown,
+)
+
+
+class Connection:
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        self.log.append(f"close {self.name}")
+
+
+def test_generator_cached_value__is_released_when_scope_stops():
+    log = []
+
+    class Container(ScopedInjector):
+        @cached_value
+        def connection():
+            connection = Connection("db", log)
+            yield connection
+            connection.close()
+
+    with begin_scope(Container):
+        connection = Container.connection
+        assert Container.connection is connection
+        assert not connection.closed
+
+    assert connection.closed
+
+
+def test_resources__are_released_in_reverse_creation_order():
+    log = []
+
+    class Container(ScopedInjector):
+        @cached_value
+        def database():
+            yield Connection("database", log)
+            log.append("close database")
+
+        @value
+        def session(database):
+            yield Connection("session", log)
+            log.append("close session")
+
+        @value
+        def handler(session):
+            return session
+
+    with begin_scope(Container):
+        Container.handler
+    assert log == ["close session", "close database"]
+
+
+def test_cleanup_raises__other_resources_are_released():
+    log = []
+
+    class Container(ScopedInjector):
+        @cached_value
+        def first():
+            yield "first"
+            log.append("close first")
+
+        @cached_value
+        def second():
+            yield "second"
+            raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        with begin_scope(Container):
+            Container.first, Container.second
+    assert log == ["close first"]
+    assert not Container.__di_cache__.is_active
+
+
+def test_generator_yields_twice__error_is_raised():
+    class Container(ScopedInjector):
+        @cached_value
+        def connection():
+            yield "first"
+            yield "second"
+
+    with pytest.raises(RuntimeError, match="didn't stop"):
+        with begin_scope(Container):
+            Container.connection
+
+
+def test_begin_scopes__resources_of_every_scope_are_released():
+    log = []
+
+    class Container(ScopedInjector):
+        @cached_value
+        def connection():
+            yield "connection"
+            log.append("close")
+
+    with begin_scopes({Container: {}}):
+        Container.connection
+    assert log == ["close"]
+
+
+def test_forked_scope__releases_only_its_own_resources():
+    log = []
+
+    class Container(ScopedInjector):
+        @value
+        def connection():
+            yield "connection"
+            log.append("close")
+
+    with begin_scope(Container) as scope:
+        Container.connection
+        with scope.fork():
+            pass
+        assert log == []
+    assert log == ["close"]
+
+
+def test_resource_value_without_scope__error_is_raised():
+    log = []
+
+    class Container(ScopedInjector):
+        @cached_value
+        def connection():
+            try:
+                yield "connection"
+            finally:
+                log.append("close")
+
+    with pytest.raises(DependencyError, match="no active scope"):
+        Container.connection
+    assert log == ["close"]
+
+
+def test_shutdown__releases_resources_and_drops_cached_values():
+    log = []
+
+    class Container(Injector):
+        @cached_value
+        def connection():
+            connection = Connection("db", log)
+            yield connection
+            connection.close()
+
+        class Nested(Injector):
+            @cached_value
+            def client():
+                yield "client"
+                log.append("close client")
+
+    first = Container.connection
+    Container.Nested.client
+    shutdown(Container)
+
+    assert log == ["close client", "close db"]
+    assert Container.connection is not first
+    shutdown(Container)
+
+
+def test_fork_unsafe_resource_in_child_process__is_not_released():
+    log = []
+
+    class Container(Injector):
+        @cached_value(fork_safe=False)
+        def connection():
+            yield "connection"
+            log.append("close")
+
+    Container.connection
+    with mock.patch.object(os, "getpid", return_value=os.getpid() + 1):
+        shutdown(Container)
+    assert log == []
+
+
+def test_not_cached_generator_value_in_usual_injector__error_is_raised():
+    with pytest.raises(DependencyError, match=r"disallowed to have not cached generator values \(connection\)"):
+        class Container(Injector):
+            @value
+            def connection():
+                yield "connection"
+
+
+def test_not_cached_async_generator_value_in_usual_injector__error_is_raised():
+    with pytest.raises(DependencyError, match=r"disallowed to have not cached generator values \(connection\)"):
+        class Container(Injector):
+            @async_value
+            async def connection():
+                yield "connection"
+
+
+def test_weak_cached_value_generator__error_is_raised():
+    def connection():
+        yield "connection"
+
+    with pytest.raises(DependencyError, match="can not be used on generator functions"):
+        weak_cached_value(connection)
+
+
+@pytest.mark.asyncio
+async def test_async_generator__is_released_when_scope_stops():
+    log = []
+
+    class Container(ScopedInjector):
+        @async_cached_value
+        async def connection():
+            yield "connection"
+            log.append("close connection")
+
+        @async_value
+        async def session(connection):
+            yield "session"
+            log.append("close session")
+
+    async with begin_scope(Container):
+        assert await aresolve(Container, "session") == "session"
+        assert log == []
+    assert log == ["close session", "close connection"]
+
+
+@pytest.mark.asyncio
+async def test_async_generator_within_sync_scope__error_is_raised():
+    class Container(ScopedInjector):
+        @async_cached_value
+        async def connection():
+            yield "connection"
+
+    with pytest.raises(DependencyError, match="async resources"):
+        with begin_scope(Container):
+            await aresolve(Container, "connection")
+
+
+@pytest.mark.asyncio
+async def test_ashutdown__releases_async_resources():
+    log = []
+
+    class Container(Injector):
+        @async_cached_value
+        async def connection():
+            yield "connection"
+            log.append("close connection")
+
+    await aresolve(Container, "connection")
+    await ashutdown(Container)
+    assert log == ["close connection"]
@@ -1,9 +1,13 @@
 import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from dite import Injector, DependencyError, ScopedInjector, value, dynamic_value, begin_scope, this
+from dite import (
+    Injector, DependencyError, ScopedInjector, value, dynamic_value, begin_scope, begin_scopes, scope_template, this, lazy,
+    cached_value,
+)
 
 
 def test_usage_example():
@@ -202,3 +206,295 @@ def test_threading_scope_does_not_leak():
     ben_thread.start()
     alice_thread.join()
     ben_thread.join()
+
+
+def test_enter_scope_template__dynamic_values_are_set():
+    class Container(ScopedInjector):
+        user = dynamic_value
+        request = dynamic_value
+
+    template = scope_template(Container)
+
+    with template.enter(user='alice', request='/home'):
+        assert (Container.user, Container.request) == ('alice', '/home')
+    with template.enter(user='ben', request='/about'):
+        assert (Container.user, Container.request) == ('ben', '/about')
+    expected_message = r"'.*Container.user' is accessed but there is no active scope"
+    with pytest.raises(DependencyError, match=expected_message):
+        _ = Container.user
+
+
+def test_apply_scope_template_to_usual_injector__raise_error():
+    class Container(Injector):
+        a = 12
+
+    with pytest.raises(DependencyError, match=r"scope_template\(\) should be applied to ScopedInjector subclass"):
+        _ = scope_template(Container)
+
+
+def test_enter_scope_template_with_wrong_values__raise_error():
+    class Container(ScopedInjector):
+        user = dynamic_value
+        request = dynamic_value
+
+    template = scope_template(Container)
+
+    expected_message = r"ScopeTemplate.enter\(\) didn't get dynamic values which are required for the injector: request."
+    with pytest.raises(DependencyError, match=expected_message):
+        _ = template.enter(user='alice')
+    expected_message = r"ScopeTemplate.enter\(\) got dynamic values which are unknown to the injector: ip."
+    with pytest.raises(DependencyError, match=expected_message):
+        _ = template.enter(user='alice', request='/home', ip='8.8.8.8')
+
+
+def test_begin_scopes__all_scopes_are_active():
+    class Container(Injector):
+        class Tenant(ScopedInjector):
+            tenant = dynamic_value
+
+            class Request(ScopedInjector):
+                user = dynamic_value
+
+        @value
+        def act(tenant, user):
+            return f"{user}@{tenant}"
+
+        tenant = this.Tenant.tenant
+        user = this.Tenant.Request.user
+
+    scopes = {Container.Tenant: {'tenant': 'acme'}, Container.Tenant.Request: {'user': 'alice'}}
+    with begin_scopes(scopes):
+        result = Container.act
+
+    assert result == "alice@acme"
+    expected_message = r"'.*Tenant.tenant' is accessed but there is no active scope"
+    with pytest.raises(DependencyError, match=expected_message):
+        _ = Container.tenant
+
+
+def test_begin_scopes_wrong_values__raise_error():
+    class Tenant(ScopedInjector):
+        tenant = dynamic_value
+
+    class Request(ScopedInjector):
+        user = dynamic_value
+
+    expected_message = r"begin_scopes\(\) got dynamic values which are unknown to the injector: ip."
+    with pytest.raises(DependencyError, match=expected_message):
+        _ = begin_scopes({Tenant: {'tenant': 'acme'}, Request: {'user': 'alice', 'ip': '8.8.8.8'}})
+
+
+def test_begin_scopes_with_usual_injector__raise_error():
+    class Tenant(ScopedInjector):
+        tenant = dynamic_value
+
+    class Container(Injector):
+        a = 12
+
+    with pytest.raises(DependencyError, match=r"begin_scopes\(\) should be applied to ScopedInjector subclass"):
+        _ = begin_scopes({Tenant: {'tenant': 'acme'}, Container: {}})
+
+
+def test_begin_scopes_same_injector_twice__raise_error():
+    class Container(Injector):
+        class Tenant(ScopedInjector):
+            tenant = dynamic_value
+
+    with pytest.raises(DependencyError, match=r"begin_scopes\(\) got the injector .*Tenant more than once"):
+        _ = begin_scopes({Container.Tenant: {'tenant': 'acme'}, type(Container.Tenant): {'tenant': 'acme'}})
+
+
+def test_use_low_level_begin_scopes_api__ok():
+    class Tenant(ScopedInjector):
+        tenant = dynamic_value
+
+    class Request(ScopedInjector):
+        user = dynamic_value
+
+    stack = begin_scopes({Tenant: {'tenant': 'acme'}, Request: {'user': 'alice'}})
+    stack.start()
+    assert (Tenant.tenant, Request.user) == ('acme', 'alice')
+    with pytest.raises(RuntimeError, match=r"ScopeStack.start\(\) should be called only once"):
+        stack.start()
+    stack.stop()
+    stack.stop()
+    with pytest.raises(DependencyError, match=r"'.*Request.user' is accessed but there is no active scope"):
+        _ = Request.user
+
+
+def test_lazy_dynamic_value_accessed_multiple_times__evaluated_once():
+    calls = []
+
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+    def load_user():
+        calls.append(1)
+        return 'alice'
+
+    with begin_scope(Container, user=lazy(load_user)):
+        a = Container.user
+        b = Container.user
+
+    assert a == b == 'alice'
+    assert calls == [1]
+
+
+def test_lazy_dynamic_value_not_accessed__not_evaluated():
+    class Foo:
+        def __init__(self, request):
+            self.request = request
+
+    class Container(ScopedInjector):
+        user = dynamic_value
+        request = dynamic_value
+        foo = Foo
+
+    def load_user():
+        raise AssertionError("must not be called")
+
+    with begin_scope(Container, user=lazy(load_user), request='/home'):
+        assert Container.foo.request == '/home'
+
+
+def test_lazy_dynamic_value_raises_error__evaluated_again_on_next_access():
+    results = iter([ValueError("database is unavailable"), 'alice'])
+
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+    def load_user():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with begin_scope(Container, user=lazy(load_user)):
+        with pytest.raises(ValueError, match="database is unavailable"):
+            _ = Container.user
+        assert Container.user == 'alice'
+
+
+def test_fork_scope__independent_cached_values_are_shared():
+    class Container(ScopedInjector):
+        user = dynamic_value
+        item_id = dynamic_value
+
+        @cached_value
+        def profile(user):
+            return {'user': user}
+
+        @cached_value
+        def item(item_id, profile):
+            return {'item': item_id, 'profile': profile}
+
+    with begin_scope(Container, user='alice', item_id=1) as scope:
+        profile, item = Container.profile, Container.item
+        with scope.fork(item_id=2):
+            forked_profile, forked_item = Container.profile, Container.item
+            forked_user = Container.user
+        assert Container.item is item
+
+    assert forked_user == 'alice'
+    assert forked_profile is profile
+    assert forked_item is not item
+    assert forked_item == {'item': 2, 'profile': profile}
+
+
+@pytest.mark.asyncio
+async def test_fork_scope_in_asyncio_tasks__each_task_gets_own_value():
+    class Container(ScopedInjector):
+        item_id = dynamic_value
+
+        @value
+        def item(item_id):
+            return item_id * 10
+
+    async def process(scope, item_id):
+        with scope.fork(item_id=item_id):
+            await asyncio.sleep(0)
+            return Container.item
+
+    with begin_scope(Container, item_id=0) as scope:
+        results = await asyncio.gather(*(process(scope, i) for i in range(3)))
+
+    assert results == [0, 10, 20]
+
+
+def test_fork_scope_with_unknown_values__raise_error():
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+    with begin_scope(Container, user='alice') as scope:
+        expected_message = r"Scope.fork\(\) got dynamic values which are unknown to the injector: ip."
+        with pytest.raises(DependencyError, match=expected_message):
+            _ = scope.fork(ip='8.8.8.8')
+
+
+def test_fork_not_started_scope__raise_error():
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+    scope = begin_scope(Container, user='alice')
+    with pytest.raises(RuntimeError, match=r"Scope.fork\(\) should be called on a started scope"):
+        _ = scope.fork(user='ben')
+
+
+def test_fork_stopped_scope__raise_error():
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+    with begin_scope(Container, user='alice') as scope:
+        pass
+    with pytest.raises(RuntimeError, match=r"Scope.fork\(\) should be called on a started scope"):
+        _ = scope.fork(user='ben')
+
+
+def test_fork_scope_in_another_thread__parent_scope_values_are_shared():
+    class Container(ScopedInjector):
+        user = dynamic_value
+        item_id = dynamic_value
+
+        @cached_value
+        def profile(user):
+            return {'user': user}
+
+    def process(scope, item_id):
+        with scope.fork(item_id=item_id):
+            return Container.item_id, Container.profile
+
+    with begin_scope(Container, user='alice', item_id=None) as scope:
+        profile = Container.profile
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            item_id, forked_profile = executor.submit(process, scope, 7).result()
+
+    assert item_id == 7
+    assert forked_profile is profile
+
+
+def test_fork_scope_inside_nested_scope__forked_scope_is_based_on_its_parent():
+    class Container(ScopedInjector):
+        user = dynamic_value
+        item_id = dynamic_value
+
+    with begin_scope(Container, user='alice', item_id=None) as scope:
+        with begin_scope(Container, user='ben', item_id=None):
+            with scope.fork(item_id=1):
+                assert (Container.user, Container.item_id) == ('alice', 1)
+
+
+def test_lazy_dynamic_value_reused_in_several_scopes__evaluated_in_each_scope():
+    users = iter(['alice', 'bob'])
+
+    class Container(ScopedInjector):
+        user = dynamic_value
+
+    load_user = lazy(lambda: next(users))
+    template = scope_template(Container)
+
+    with template.enter(user=load_user):
+        first = Container.user
+    with template.enter(user=load_user):
+        second = Container.user
+
+    assert (first, second) == ('alice', 'bob')
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, DependencyError, session, resolve, value, this, thread_local_cached_value, dynamic_value,
+    begin_scope,
+)
+from dite.concurrent import submit_in_scope
+
+
+def test_session__shared_dependencies_are_built_once():
+    calls = []
+
+    class Container(Injector):
+        @value
+        def settings():
+            calls.append("settings")
+            return object()
+
+        @value
+        def a(settings):
+            return settings
+
+        @value
+        def b(settings):
+            return settings
+
+        class Nested(Injector):
+            settings = (this << 1).settings
+
+    with session(Container):
+        a, b = Container.a, Container.b
+        nested = Container.Nested.settings
+        resolved = resolve(Container, "a")
+
+    assert a is b is nested is resolved
+    assert calls == ["settings"]
+
+
+def test_without_session__dependencies_are_built_per_access():
+    calls = []
+
+    class Container(Injector):
+        @value
+        def settings():
+            calls.append("settings")
+            return object()
+
+        @value
+        def a(settings):
+            return settings
+
+        @value
+        def b(settings):
+            return settings
+
+    assert Container.a is not Container.b
+    assert calls == ["settings", "settings"]
+
+
+def test_session_ends__values_are_built_again():
+    class Container(Injector):
+        settings = object
+
+        @value
+        def a(settings):
+            return settings
+
+        @value
+        def b(settings):
+            return settings
+
+    with session(Container):
+        first = Container.a
+    with session(Container):
+        second = Container.a
+
+    assert first is not second
+
+
+def test_session_of_other_injector__is_not_used():
+    class Container(Injector):
+        settings = object
+
+        @value
+        def a(settings):
+            return settings
+
+        @value
+        def b(settings):
+            return settings
+
+    class Other(Injector):
+        settings = object
+
+    with session(Other):
+        assert Container.a is not Container.b
+
+
+def test_session__is_visible_in_copied_context():
+    class Container(Injector):
+        settings = object
+
+        @value
+        def a(settings):
+            return settings
+
+        @value
+        def b(settings):
+            return settings
+
+    with session(Container), ThreadPoolExecutor(max_workers=1) as executor:
+        a = Container.a
+        b = submit_in_scope(executor, lambda: Container.b).result()
+
+    assert a is b
+
+
+def test_session_with_thread_local_value__other_thread_gets_own_instance():
+    class Container(Injector):
+        connection = thread_local_cached_value(object)
+
+        @value
+        def client(connection):
+            return {"connection": connection}
+
+    with session(Container), ThreadPoolExecutor(max_workers=1) as executor:
+        main = Container.client
+        worker = submit_in_scope(executor, lambda: Container.client).result()
+
+    assert main["connection"] is not worker["connection"]
+
+
+def test_session_with_scope_values__values_of_ended_scope_are_not_returned():
+    class Container(Injector):
+        @value
+        def greeting(user):
+            return f"Hello, {user}"
+
+        user = this.Request.user
+
+        class Request(ScopedInjector):
+            user = dynamic_value
+
+    with session(Container):
+        with begin_scope(Container.Request, user="alice"):
+            first = Container.greeting
+        with begin_scope(Container.Request, user="bob"):
+            second = Container.greeting
+
+    assert (first, second) == ("Hello, alice", "Hello, bob")
+
+
+def test_session_of_abstract_injector__error_is_raised():
+    class Container(Injector, abstract=True):
+        pass
+
+    with pytest.raises(DependencyError, match="concrete injector"):
+        session(Container)
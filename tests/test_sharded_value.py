@@ -0,0 +1,183 @@
+import pytest
+
+from dite import (
+    Injector, ScopedInjector, DependencyError, sharded_value, dynamic_value, begin_scope, shutdown, this, value,
+)
+
+
+class Client:
+    def __init__(self, shard, url_template):
+        self.shard = shard
+        self.url = url_template.format(shard)
+
+
+def test_sharded_value__instance_is_built_per_key():
+    class Container(ScopedInjector):
+        shard = dynamic_value
+        url_template = "postgresql://db-{}/"
+        client = sharded_value(Client, key=this.shard)
+
+    with begin_scope(Container, shard=1):
+        first = Container.client
+        assert Container.client is first
+    with begin_scope(Container, shard=2):
+        second = Container.client
+
+    assert (first.shard, first.url) == (1, "postgresql://db-1/")
+    assert (second.shard, second.url) == (2, "postgresql://db-2/")
+
+
+def test_shards__are_kept_for_injector_lifetime():
+    calls = []
+
+    class Container(Injector):
+        url_template = "postgresql://db-{}/"
+
+        @sharded_value(key=this.Request.shard)
+        def client(shard, url_template):
+            calls.append(shard)
+            return Client(shard, url_template)
+
+        class Request(ScopedInjector):
+            shard = dynamic_value
+            client = (this << 1).client
+
+    with begin_scope(Container.Request, shard="eu"):
+        first = Container.Request.client
+    with begin_scope(Container.Request, shard="eu"):
+        second = Container.Request.client
+
+    assert first is second
+    assert calls == ["eu"]
+
+
+def test_maxsize__least_recently_used_shard_is_evicted():
+    evicted = []
+    built = []
+
+    class Container(Injector):
+        @sharded_value(key=this.Request.shard, maxsize=2, on_evict=evicted.append)
+        def client(shard):
+            built.append(shard)
+            return f"client-{shard}"
+
+        class Request(ScopedInjector):
+            shard = dynamic_value
+
+    for shard in [1, 2, 1, 3, 1, 2]:
+        with begin_scope(Container.Request, shard=shard):
+            Container.client
+
+    assert evicted == ["client-2", "client-3"]
+    assert built == [1, 2, 3, 2]
+
+
+def test_maxsize_is_exceeded_by_shards_in_use__only_idle_shards_are_evicted():
+    evicted = []
+
+    class Container(Injector):
+        @sharded_value(key=this.Request.shard, maxsize=1, on_evict=evicted.append)
+        def client(shard):
+            return f"client-{shard}"
+
+        class Request(ScopedInjector):
+            shard = dynamic_value
+
+    with begin_scope(Container.Request, shard=1):
+        assert Container.client == "client-1"
+        with begin_scope(Container.Request, shard=2):
+            assert Container.client == "client-2"
+            assert evicted == []
+        assert evicted == ["client-2"]
+        assert Container.client == "client-1"
+    assert evicted == ["client-2"]
+
+
+def test_forked_scope_uses_shard__shard_is_evicted_after_fork_stops():
+    evicted = []
+
+    class Container(Injector):
+        @sharded_value(key=this.Request.shard, maxsize=1, on_evict=evicted.append)
+        def client(shard):
+            return f"client-{shard}"
+
+        class Request(ScopedInjector):
+            shard = dynamic_value
+
+    with begin_scope(Container.Request, shard=1) as scope:
+        _ = Container.client
+        with scope.fork(shard=2):
+            _ = Container.client
+        assert evicted == ["client-2"]
+
+
+def test_shutdown__remaining_shards_are_evicted():
+    evicted = []
+
+    class Container(Injector):
+        shard = 1
+        client = sharded_value(lambda shard: f"client-{shard}", key="shard", on_evict=evicted.append)
+
+    _ = Container.client
+    shutdown(Container)
+
+    assert evicted == ["client-1"]
+
+
+def test_scope_of_scoped_sharded_value_stops__remaining_shards_are_evicted():
+    evicted = []
+
+    class Container(ScopedInjector):
+        shard = dynamic_value
+        client = sharded_value(lambda shard: f"client-{shard}", key=this.shard, on_evict=evicted.append)
+
+    with begin_scope(Container, shard=1):
+        _ = Container.client
+        assert evicted == []
+
+    assert evicted == ["client-1"]
+
+
+def test_key_is_built_from_graph__value_is_used_as_key():
+    class Container(ScopedInjector):
+        tenant = dynamic_value
+
+        @value
+        def tenant_shard(tenant):
+            return hash(tenant) % 4
+
+        @sharded_value(key=this.tenant_shard)
+        def client(shard):
+            return shard
+
+    with begin_scope(Container, tenant="acme"):
+        assert Container.client == hash("acme") % 4
+
+
+def test_shutdown__shards_are_dropped():
+    class Container(Injector):
+        shard = 1
+        client = sharded_value(lambda shard: object(), key="shard")
+
+    first = Container.client
+    shutdown(Container)
+    assert Container.client is not first
+
+
+def test_no_active_scope__error_is_raised():
+    class Container(ScopedInjector):
+        shard = 1
+        client = sharded_value(lambda shard: shard, key=this.shard)
+
+    with pytest.raises(DependencyError, match="no active scope"):
+        Container.client
+
+
+def test_factory_without_parameters__error_is_raised():
+    with pytest.raises(DependencyError, match="shard key as the first parameter"):
+        sharded_value(lambda: None, key="shard")
+
+
+def test_invalid_key__error_is_raised():
+    with pytest.raises(DependencyError, match="attribute name or a 'this' expression"):
+        sharded_value(lambda shard: shard, key=1)
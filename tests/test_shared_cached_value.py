@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+import uuid
+from multiprocessing import shared_memory
+
+import pytest
+
+from dite import Injector, shared_cached_value
+from dite.factories import shared_cached_value as shared_module
+
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="shared cached values require a POSIX system")
+
+CHILD_SCRIPT = """
+import sys
+from dite import Injector, shared_cached_value
+
+class Container(Injector):
+    @shared_cached_value(key=sys.argv[1])
+    def table():
+        raise AssertionError("the value must be attached rather than built")
+
+print(bytes(Container.table).decode())
+"""
+
+
+@pytest.fixture
+def key():
+    key = f"test-{uuid.uuid4()}"
+    yield key
+    for name in list(shared_module._segments):
+        shared_module._release_segment(name)
+
+
+def test_request_value_multiple_times__return_the_same_value(key):
+    calls = []
+
+    class Container(Injector):
+        @shared_cached_value(key=key)
+        def table():
+            calls.append(1)
+            return b"embeddings"
+
+    a = Container.table
+    b = Container.table
+
+    assert a is b
+    assert bytes(a) == b"embeddings"
+    assert calls == [1]
+
+
+def test_value_is_shared__another_process_attaches_without_building(key):
+    class Container(Injector):
+        @shared_cached_value(key=key)
+        def table():
+            return b"embeddings"
+
+    _ = Container.table
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, key], env=environment, capture_output=True, check=True
+    )
+
+    assert result.stdout.strip() == b"embeddings"
+
+
+def test_value_is_pickled__object_is_rebuilt_from_shared_memory(key):
+    class Container(Injector):
+        @shared_cached_value(key=key)
+        def table():
+            return {"a": [1, 2, 3]}
+
+    assert Container.table == {"a": [1, 2, 3]}
+
+
+def test_last_process_releases_segment__segment_is_unlinked(key):
+    class Container(Injector):
+        @shared_cached_value(key=key)
+        def table():
+            return b"embeddings"
+
+    _ = Container.table
+    [name] = shared_module._segments
+    shared_module._release_segment(name)
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_forked_child_exits__segment_is_kept_for_parent(key):
+    class Container(Injector):
+        @shared_cached_value(key=key)
+        def table():
+            return b"embeddings"
+
+    _ = Container.table
+    [name] = shared_module._segments
+    for _ in range(2):
+        pid = os.fork()
+        if pid == 0:
+            # what the atexit hook of the child does on sys.exit()
+            shared_module._release_segments()
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+    segment = shared_memory.SharedMemory(name=name)
+    segment.close()
+    with shared_module._reference_counter(name) as counter:
+        assert counter.read() == 1
+
+
+def test_shared_value_depends_on_shared_value__both_are_built(key):
+    class Container(Injector):
+        @shared_cached_value(key=key + "-words")
+        def words():
+            return b"a b"
+
+        @shared_cached_value(key=key + "-index")
+        def index(words):
+            return bytes(words) + b" indexed"
+
+    assert bytes(Container.index) == b"a b indexed"
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from dite import Injector, ScopedInjector, DependencyError, thread_local_cached_value, begin_scope
+
+
+def _in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_request_value_multiple_times_in_one_thread__return_the_same_value():
+    class Client:
+        pass
+
+    class Container(Injector):
+        client = thread_local_cached_value(Client)
+
+    a = Container.client
+    b = Container.client
+
+    assert a is b
+
+
+def test_request_value_in_different_threads__return_distinct_values():
+    class Client:
+        pass
+
+    class Container(Injector):
+        client = thread_local_cached_value(Client)
+
+    a = Container.client
+    b = _in_thread(lambda: Container.client)
+    c = Container.client
+
+    assert a is not b
+    assert a is c
+
+
+def test_thread_exits__value_garbage_collected():
+    is_garbage_collected = threading.Event()
+
+    class Client:
+        def __del__(self):
+            is_garbage_collected.set()
+
+    class Container(Injector):
+        @thread_local_cached_value
+        def client():
+            return Client()
+
+    _in_thread(lambda: id(Container.client))
+
+    assert is_garbage_collected.is_set()
+
+
+def test_use_in_scoped_injector__value_cached_per_scope_and_thread():
+    class Client:
+        pass
+
+    class Container(ScopedInjector):
+        client = thread_local_cached_value(Client)
+
+    with begin_scope(Container):
+        a = Container.client
+        b = Container.client
+    with begin_scope(Container):
+        c = Container.client
+
+    assert a is b
+    assert a is not c
+
+
+def test_access_value_no_active_scope__raise_error():
+    class Container(ScopedInjector):
+        client = thread_local_cached_value(object)
+
+    with pytest.raises(DependencyError, match="cached_value usage is disallowed when there is no active scope"):
+        _ = Container.client
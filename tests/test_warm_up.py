@@ -0,0 +1,153 @@
+import gc
+import threading
+
+import pytest
+
+from dite import Injector, ScopedInjector, DependencyError, cached_value, dynamic_value, begin_scope, this, warm_up
+
+
+@pytest.fixture(autouse=True)
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+def test_warm_up__all_cached_values_are_built_in_dependency_order():
+    created = []
+
+    class Nested(Injector):
+        engine = (this << 1).engine
+
+        @cached_value
+        def session(engine):
+            created.append("session")
+
+    class Container(Injector):
+        nested = Nested
+
+        @cached_value
+        def engine():
+            created.append("engine")
+
+        @cached_value
+        def cache():
+            created.append("cache")
+
+        @cached_value
+        def service(engine, cache):
+            created.append("service")
+
+    warm_up(Container, freeze=False)
+
+    assert sorted(created) == ["cache", "engine", "service", "session"]
+    assert created.index("engine") < created.index("service")
+    assert created.index("cache") < created.index("service")
+    assert created.index("engine") < created.index("session")
+    _ = Container.service, Container.nested.session
+    assert len(created) == 4
+
+
+def test_injector_refers_to_missing_parent__other_values_are_built():
+    class Child(Injector):
+        parent_cfg = (this << 1).cfg
+
+        @cached_value
+        def client(parent_cfg):
+            return {"cfg": parent_cfg}
+
+        @cached_value
+        def settings():
+            return {}
+
+    warm_up(Child, freeze=False)
+
+    assert "settings" in Child.__di_cache__
+    assert "client" not in Child.__di_cache__
+
+
+def test_warm_up_with_include__only_included_values_are_built():
+    created = []
+
+    class Nested(Injector):
+        engine = (this << 1).engine
+
+        @cached_value
+        def session(engine):
+            created.append("session")
+
+    class Container(Injector):
+        nested = Nested
+
+        @cached_value
+        def engine():
+            created.append("engine")
+
+        @cached_value
+        def service(engine):
+            created.append("service")
+
+    warm_up(Container, include=["nested"], freeze=False)
+
+    assert created == ["engine", "session"]
+
+
+def test_warm_up_in_parallel__independent_values_are_built_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    class Container(Injector):
+        @cached_value
+        def a():
+            barrier.wait()
+            return "a"
+
+        @cached_value
+        def b():
+            barrier.wait()
+            return "b"
+
+        @cached_value
+        def c(a, b):
+            return a + b
+
+    warm_up(Container, parallel=2, freeze=False)
+
+    assert Container.c == "ab"
+
+
+def test_warm_up__gc_is_frozen():
+    class Container(Injector):
+        value = cached_value(object)
+
+    warm_up(Container)
+
+    assert gc.get_freeze_count() > 0
+
+
+def test_warm_up_scoped_injector__only_active_scopes_are_built():
+    created = []
+
+    class Container(Injector):
+        @cached_value
+        def engine():
+            created.append("engine")
+
+        class Request(ScopedInjector):
+            user = dynamic_value
+
+            @cached_value
+            def session(user):
+                created.append(user)
+
+    warm_up(Container, freeze=False)
+    with begin_scope(Container.Request, user="alice"):
+        warm_up(Container, include=["Request"], freeze=False)
+
+    assert created == ["engine", "alice"]
+
+
+def test_warm_up_abstract_injector__raise_error():
+    class Container(Injector, abstract=True):
+        value = cached_value(object)
+
+    with pytest.raises(DependencyError, match=r"warm_up\(\) should be applied to a concrete injector"):
+        warm_up(Container)
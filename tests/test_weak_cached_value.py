@@ -0,0 +1,108 @@
+import logging
+import weakref
+
+from dite import Injector, ScopedInjector, cached_value, weak_cached_value, begin_scope
+
+
+class Schema:
+    pass
+
+
+def test_value_is_referenced__return_the_same_value():
+    class Container(Injector):
+        schema = weak_cached_value(Schema)
+
+    a = Container.schema
+    b = Container.schema
+
+    assert a is b
+
+
+def test_value_is_not_referenced__value_garbage_collected_and_rebuilt():
+    class Container(Injector):
+        schema = weak_cached_value(Schema)
+
+    reference = weakref.ref(Container.schema)
+
+    assert reference() is None
+    assert isinstance(Container.schema, Schema)
+
+
+def test_value_is_not_weakly_referenceable__cache_value_strongly():
+    calls = 0
+
+    class Container(Injector):
+        @weak_cached_value
+        def table():
+            nonlocal calls
+            calls += 1
+            return {"a": 1}
+
+    a = Container.table
+    del a
+    b = Container.table
+
+    assert calls == 1
+    assert b == {"a": 1}
+
+
+def test_value_is_cached__dependencies_are_not_kept_alive():
+    class Tokenizer:
+        def __init__(self, vocabulary):
+            self.size = len(vocabulary.words)
+
+    class Vocabulary:
+        words = ["a", "b"]
+
+    vocabularies = []
+
+    class Container(Injector):
+        tokenizer = weak_cached_value(Tokenizer)
+
+        @weak_cached_value
+        def vocabulary():
+            result = Vocabulary()
+            vocabularies.append(weakref.ref(result))
+            return result
+
+    tokenizer = Container.tokenizer
+
+    assert tokenizer.size == 2
+    assert vocabularies[0]() is None
+
+
+def test_use_in_scoped_injector__value_cached_within_scope():
+    class Container(ScopedInjector):
+        schema = weak_cached_value(Schema)
+
+    with begin_scope(Container):
+        a = Container.schema
+        b = Container.schema
+    with begin_scope(Container):
+        c = Container.schema
+
+    assert a is b
+    assert a is not c
+
+
+def test_weak_dependency_is_rebuilt__no_stale_warning(caplog):
+    class Tokenizer:
+        def __init__(self, vocabulary):
+            self.size = len(vocabulary)
+
+    class Container(Injector):
+        tokenizer = cached_value(Tokenizer)
+
+        @weak_cached_value
+        def vocabulary():
+            return Vocabulary(["a", "b"])
+
+    tokenizer = Container.tokenizer
+    with caplog.at_level(logging.WARNING):
+        assert Container.tokenizer is tokenizer
+        assert Container.tokenizer is tokenizer
+    assert caplog.records == []
+
+
+class Vocabulary(list):
+    pass